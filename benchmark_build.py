@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+End-to-end benchmark of the publication build on synthetic scaled corpora
+Builds publications.txt files from 1x to 1000x the real one, runs the
+parser, the dedup stage and both page generators on each in a scratch directory, and
+records per-stage time (from a cold and a warm entry cache) and peak memory. Outputs are checked against the
+golden hashes in benchmarks/golden.json (year shards included, asset
+fingerprints left out) and every run is appended to
+benchmarks/results.jsonl so regressions can be tracked between versions.
+Usage: python benchmark_build.py [--scales 1,10,100,1000] [--update-golden]
+"""
+
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import build_manifest
+import dedup_publications
+import entry_cache
+import fingerprint_assets
+import generate_publications_html
+import generate_research_grants_html
+import parse_publications
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_TXT_PATH = os.path.join(BASE_DIR, 'publications.txt')
+BENCHMARK_DIR = os.path.join(BASE_DIR, 'benchmarks')
+GOLDEN_PATH = os.path.join(BENCHMARK_DIR, 'golden.json')
+RESULTS_PATH = os.path.join(BENCHMARK_DIR, 'results.jsonl')
+
+DEFAULT_SCALES = [1, 10, 100, 1000]
+
+# Stage name -> (module whose main() runs it, outputs it writes as glob patterns)
+STAGES = {
+    'parse_publications': (parse_publications, ['publications_data.json', 'research_grants_data.json']),
+    'dedup_publications': (dedup_publications, ['publications_dedup.json']),
+    'generate_publications_html': (generate_publications_html, ['publications.html',
+                                                                'publications/*.html']),
+    'generate_research_grants_html': (generate_research_grants_html, ['research-grants.html']),
+}
+
+def build_corpus(scale, path):
+    """Write a synthetic publications.txt with every entry repeated scale times
+
+    Copy k of a line gets a " [rk]" tag so repeated entries are distinct
+    texts (and the tag can never be read as a year). Scale 1 is the real
+    file unchanged.
+    """
+    with open(SOURCE_TXT_PATH, 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+
+    blocks = []          # (is_header, lines)
+    for line in lines:
+        is_header = line.strip() in parse_publications.SECTION_HEADERS
+        if blocks and not is_header and not blocks[-1][0]:
+            blocks[-1][1].append(line)
+        else:
+            blocks.append((is_header, [line]))
+
+    with open(path, 'w', encoding='utf-8') as out:
+        for is_header, block in blocks:
+            if is_header:
+                out.write('\n'.join(block) + '\n')
+                continue
+            for copy in range(scale):
+                for line in block:
+                    if copy and line.strip():
+                        line = f"{line} [r{copy}]"
+                    out.write(line + '\n')
+    return os.path.getsize(path)
+
+def point_stages_at(directory):
+    """Redirect every stage's input/output paths into the scratch directory"""
+    parse_publications.PUBLICATIONS_TXT_PATH = os.path.join(directory, 'publications.txt')
+    parse_publications.PUBLICATIONS_JSON_PATH = os.path.join(directory, 'publications_data.json')
+    parse_publications.GRANTS_JSON_PATH = os.path.join(directory, 'research_grants_data.json')
+    dedup_publications.PUBLICATIONS_JSON_PATH = os.path.join(directory, 'publications_data.json')
+    dedup_publications.DEDUP_JSON_PATH = os.path.join(directory, 'publications_dedup.json')
+    generate_publications_html.PUBLICATIONS_JSON_PATH = os.path.join(directory, 'publications_data.json')
+    generate_publications_html.PUBLICATIONS_HTML_PATH = os.path.join(directory, 'publications.html')
+    generate_publications_html.PUBLICATIONS_SHARD_DIR = os.path.join(directory, 'publications')
+    generate_research_grants_html.GRANTS_JSON_PATH = os.path.join(directory, 'research_grants_data.json')
+    generate_research_grants_html.GRANTS_HTML_PATH = os.path.join(directory, 'research-grants.html')
+    # Keep the scratch build out of the real incremental build manifest
+    build_manifest.MANIFEST_DIR = os.path.join(directory, '.build')
+
+def clear_caches():
+    parse_publications.extract_year_from_text.cache_clear()
+    database = os.path.join(build_manifest.MANIFEST_DIR, entry_cache.DATABASE_NAME)
+    if os.path.exists(database):
+        os.remove(database)
+
+def run_stage(module, measure_memory, cold=True):
+    """Run one stage; returns (seconds, peak traced bytes)
+
+    A cold run starts without the in-process and on-disk entry caches, a
+    warm one reuses what the previous run stored.
+    """
+    if cold:
+        clear_caches()
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        module.main(force=True)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if measure_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak
+
+# Pages link the stylesheet and script by fingerprinted name (style.<hash>.css),
+# which changes with every asset edit; hashes are taken with the name restored
+FINGERPRINTED_ASSET = re.compile(
+    rb'(?<=[\w-])\.[0-9a-f]{%d}(?=\.(?:css|js)\b)' % fingerprint_assets.FINGERPRINT_LENGTH)
+
+def hash_output(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if path.endswith('.html'):
+        data = FINGERPRINTED_ASSET.sub(b'', data)
+    return hashlib.sha256(data).hexdigest()
+
+def output_names(directory, patterns):
+    """Files matching the output patterns, relative to the scratch directory"""
+    return [os.path.relpath(path, directory).replace(os.sep, '/')
+            for pattern in patterns
+            for path in sorted(glob.glob(os.path.join(directory, pattern)))]
+
+def benchmark_scale(scale, directory, measure_memory):
+    """Benchmark every stage at one scale; returns the per-stage results"""
+    corpus_bytes = build_corpus(scale, os.path.join(directory, 'publications.txt'))
+    results = {'scale': scale, 'corpus_bytes': corpus_bytes, 'stages': {}}
+    for stage, (module, outputs) in STAGES.items():
+        seconds, _ = run_stage(module, measure_memory=False)
+        warm_seconds, _ = run_stage(module, measure_memory=False, cold=False)
+        peak = run_stage(module, measure_memory=True)[1] if measure_memory else None
+        results['stages'][stage] = {
+            'seconds': round(seconds, 6),
+            'warm_seconds': round(warm_seconds, 6),
+            'peak_memory_bytes': peak,
+            'outputs': {name: hash_output(os.path.join(directory, name))
+                        for name in output_names(directory, outputs)},
+        }
+    return results
+
+def check_golden(results, golden):
+    """Compare output hashes with the golden ones; returns a list of mismatches"""
+    mismatches = []
+    for run in results:
+        expected = golden.get(str(run['scale']))
+        if expected is None:
+            continue
+        produced = {}
+        for stage in run['stages'].values():
+            produced.update(stage['outputs'])
+        for name, digest in produced.items():
+            if expected.get(name) not in (None, digest):
+                mismatches.append(f"{name} at {run['scale']}x")
+        for name in expected.keys() - produced.keys():
+            mismatches.append(f"{name} at {run['scale']}x (not written)")
+    return mismatches
+
+def load_golden():
+    try:
+        with open(GOLDEN_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the publication build at several scales')
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)),
+                        help='comma-separated corpus multipliers (default: 1,10,100,1000)')
+    parser.add_argument('--skip-memory', action='store_true',
+                        help='skip the extra traced run used to measure peak memory')
+    parser.add_argument('--update-golden', action='store_true',
+                        help='store this run\'s output hashes as the new golden files')
+    args = parser.parse_args()
+    scales = [int(scale) for scale in args.scales.split(',')]
+
+    runs = []
+    with tempfile.TemporaryDirectory(prefix='publications-bench-') as directory:
+        point_stages_at(directory)
+        for scale in scales:
+            run = benchmark_scale(scale, directory, measure_memory=not args.skip_memory)
+            runs.append(run)
+            print(f"{scale}x ({run['corpus_bytes'] / 1024:.0f} KB corpus)")
+            for stage, result in run['stages'].items():
+                peak = result['peak_memory_bytes']
+                peak_text = f"{peak / 1024 / 1024:8.1f} MB peak" if peak is not None else ''
+                print(f"  {stage:<32} {result['seconds']:9.3f} s cold "
+                      f"{result['warm_seconds']:9.3f} s warm {peak_text}")
+
+    golden = load_golden()
+    if args.update_golden:
+        for run in runs:
+            golden[str(run['scale'])] = {
+                name: digest for stage in run['stages'].values()
+                for name, digest in stage['outputs'].items()
+            }
+        os.makedirs(BENCHMARK_DIR, exist_ok=True)
+        with open(GOLDEN_PATH, 'w', encoding='utf-8') as f:
+            json.dump(golden, f, indent=2, sort_keys=True)
+        mismatches = []
+        print(f"Golden hashes updated: {GOLDEN_PATH}")
+    else:
+        mismatches = check_golden(runs, golden)
+
+    record = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'golden_mismatches': mismatches,
+        'runs': runs,
+    }
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    with open(RESULTS_PATH, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, sort_keys=True) + '\n')
+    print(f"Results appended to: {RESULTS_PATH}")
+
+    if mismatches:
+        print("Output differs from golden files: " + ', '.join(mismatches))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
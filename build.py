@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Build the whole site with one command
+Runs every build stage (asset fingerprinting, parsing publications.txt,
+deduplication, the publication and grant pages, gallery image derivatives,
+the gallery page, the service worker and text asset compression) as a
+dependency graph: a stage starts as soon as the stages it reads from have
+finished, and independent stages run side by side on a pool of --jobs
+worker processes. Stages whose inputs are unchanged skip themselves as
+usual. Prints each stage's output as it finishes and a timing summary.
+Usage: python build.py [stage ...] [--jobs N] [--force]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import compress_assets
+import dedup_publications
+import fingerprint_assets
+import generate_gallery_html
+import generate_image_derivatives
+import generate_publications_html
+import generate_research_grants_html
+import generate_service_worker
+import parse_publications
+
+def run_fingerprint(force, jobs):
+    return fingerprint_assets.main(force=force)
+
+def run_parse(force, jobs):
+    return parse_publications.main(force=force)
+
+def run_dedup(force, jobs):
+    return dedup_publications.main(force=force)
+
+def run_publications(force, jobs):
+    return generate_publications_html.main(force=force)
+
+def run_grants(force, jobs):
+    return generate_research_grants_html.main(force=force)
+
+def run_gallery(force, jobs):
+    return generate_gallery_html.main(force=force)
+
+def run_service_worker(force, jobs):
+    return generate_service_worker.main(force=force)
+
+def run_derivatives(force, jobs):
+    rendered = generate_image_derivatives.build_derivatives(jobs=jobs, force=force)[1]
+    return rendered > 0
+
+def run_compress(force, jobs):
+    seen, written = compress_assets.compress_site(force=force)
+    print(f"Checked {seen} text assets, wrote {written} compressed variants")
+    return written > 0
+
+# Stage name -> (function running it, stages whose outputs it reads), in build order
+STAGES = {
+    # Rewrites the templates, so it comes before the page generators
+    'fingerprint_assets': (run_fingerprint, []),
+    'parse_publications': (run_parse, []),
+    'dedup_publications': (run_dedup, ['parse_publications']),
+    'generate_publications_html': (run_publications, ['parse_publications', 'fingerprint_assets']),
+    'generate_research_grants_html': (run_grants, ['parse_publications', 'fingerprint_assets']),
+    'generate_image_derivatives': (run_derivatives, []),
+    # The grid's srcset lists the resized copies
+    'generate_gallery_html': (run_gallery, ['fingerprint_assets', 'generate_image_derivatives']),
+    # Precaches the pages and assets the stages above write
+    'generate_service_worker': (run_service_worker, ['fingerprint_assets',
+                                                     'generate_publications_html',
+                                                     'generate_research_grants_html',
+                                                     'generate_gallery_html']),
+    # Compresses the assets, JSON, HTML and script the other stages write
+    'compress_assets': (run_compress, ['fingerprint_assets',
+                                       'generate_publications_html',
+                                       'generate_research_grants_html',
+                                       'generate_gallery_html',
+                                       'generate_service_worker']),
+}
+
+def with_dependencies(targets):
+    """The target stages plus everything they depend on, in build order"""
+    selected = set()
+    todo = list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in selected:
+            selected.add(name)
+            todo.extend(STAGES[name][1])
+    return [name for name in STAGES if name in selected]
+
+def run_stage(name, force, jobs):
+    """Worker: run one stage with its output captured
+
+    Returns a result dict with the status ('built', 'current' when it had
+    nothing to do, or 'failed'), the time taken and the printed output.
+    """
+    function = STAGES[name][0]
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        try:
+            status = 'built' if function(force, jobs) else 'current'
+        except Exception:
+            traceback.print_exc(file=output)
+            status = 'failed'
+    return {'status': status, 'seconds': time.perf_counter() - start, 'output': output.getvalue()}
+
+def report_stage(name, result):
+    print(f"── {name} ({result['status']}, {result['seconds']:.2f}s)")
+    if result['output']:
+        print(result['output'].rstrip('\n'))
+
+def build(stages, jobs=None, force=False):
+    """Run the stages on a worker pool as their dependencies finish
+
+    A stage whose dependency failed is not run and reported as 'skipped'.
+    Returns the result dict of every stage, in build order.
+    """
+    results = {}
+    waiting = list(stages)
+    running = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while waiting or running:
+            for name in list(waiting):
+                dependencies = STAGES[name][1]
+                if not all(dependency in results for dependency in dependencies):
+                    continue
+                waiting.remove(name)
+                if any(results[dependency]['status'] in ('failed', 'skipped')
+                       for dependency in dependencies):
+                    results[name] = {'status': 'skipped', 'seconds': 0.0, 'output': ''}
+                    report_stage(name, results[name])
+                else:
+                    running[pool.submit(run_stage, name, force, jobs)] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                report_stage(name, results[name])
+    return {name: results[name] for name in stages}
+
+def print_summary(results, elapsed, jobs):
+    print("\nStage timings:")
+    for name, result in results.items():
+        print(f"  {name:<32} {result['seconds']:8.2f} s  {result['status']}")
+    stage_seconds = sum(result['seconds'] for result in results.values())
+    print(f"Build took {elapsed:.2f}s with {jobs} jobs ({stage_seconds:.2f}s spent in stages)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the site, running independent stages in parallel')
+    parser.add_argument('stages', nargs='*', metavar='stage',
+                        help='stages to build, with the stages they depend on (default: all). '
+                             'One of: ' + ', '.join(STAGES))
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: number of CPUs)')
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild every stage even if its inputs are unchanged')
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    unknown = [name for name in args.stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage: {', '.join(unknown)}")
+
+    stages = with_dependencies(args.stages or STAGES)
+    print(f"Building {len(stages)} stages with {args.jobs} jobs...")
+    start = time.perf_counter()
+    results = build(stages, jobs=args.jobs, force=args.force)
+    print_summary(results, time.perf_counter() - start, args.jobs)
+
+    failed = [name for name, result in results.items() if result['status'] == 'failed']
+    if failed:
+        print(f"❌ Failed: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
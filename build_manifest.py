@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental build manifest shared by the site build scripts
+Each stage records the content hashes of its inputs and outputs under
+.build/<stage>.json. A stage whose inputs and outputs still match the
+recorded hashes can be skipped, and outputs are only rewritten when their
+bytes change, so file mtimes (and the server's ETags) stay stable.
+"""
+
+import filecmp
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_DIR = os.path.join(BASE_DIR, '.build')
+
+def hash_file(path):
+    """SHA-256 of a file's contents, or None if it does not exist
+
+    Read in chunks, so large images are never held in memory whole.
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+def manifest_key(path):
+    """Paths are stored relative to the project so the manifest is portable"""
+    return os.path.relpath(os.path.abspath(path), BASE_DIR)
+
+def stage_manifest_path(stage):
+    return os.path.join(MANIFEST_DIR, f'{stage}.json')
+
+def load_stage(stage):
+    try:
+        with open(stage_manifest_path(stage), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def hash_paths(paths):
+    return {manifest_key(path): hash_file(path) for path in paths}
+
+def is_stage_current(stage, inputs, outputs, settings=None):
+    """True if the stage's inputs and outputs match what was last recorded
+
+    settings holds values other than files that the outputs depend on
+    (e.g. a window derived from today's date); they must match too.
+    """
+    recorded = load_stage(stage)
+    if recorded is None:
+        return False
+    if recorded.get('settings') != settings:
+        return False
+    if recorded.get('inputs') != hash_paths(inputs):
+        return False
+    output_hashes = hash_paths(outputs)
+    return None not in output_hashes.values() and recorded.get('outputs') == output_hashes
+
+def record_stage(stage, inputs, outputs, settings=None):
+    """Remember the current input and output hashes (and settings) of a stage"""
+    os.makedirs(MANIFEST_DIR, exist_ok=True)
+    data = {'inputs': hash_paths(inputs), 'outputs': hash_paths(outputs)}
+    if settings is not None:
+        data['settings'] = settings
+    tmp_path = stage_manifest_path(stage) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, stage_manifest_path(stage))
+
+def write_if_changed(path, content, encoding='utf-8'):
+    """Write text to path unless the file already holds the same bytes
+
+    Returns True if the file was written.
+    """
+    data = content.encode(encoding)
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+@contextmanager
+def open_if_changed(path, encoding='utf-8'):
+    """Open a temporary text file that replaces path on exit if its bytes differ
+
+    Lets generators stream their output while still leaving an identical
+    file (and its mtime) untouched.
+    """
+    tmp_path = path + '.tmp'
+    f = open(tmp_path, 'w', encoding=encoding)
+    try:
+        yield f
+        f.close()
+        if os.path.exists(path) and filecmp.cmp(tmp_path, path, shallow=False):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        f.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Precompress text assets after the pages are generated
+Writes a .gz (and a .br when the brotli module is installed) next to every
+HTML, CSS, JS, JSON, XML and SVG file so server.py can send them without
+compressing on each request.
+Usage: python compress_assets.py [--force]
+"""
+
+import argparse
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+COMPRESSIBLE_EXTENSIONS = {'.html', '.css', '.js', '.json', '.xml', '.svg', '.txt'}
+
+# Content-Encoding name and file suffix, best first
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+# Directories that never hold servable text assets
+SKIP_DIRS = {'.git', '__pycache__', 'images', 'Instagram Aktif'}
+
+# Files this small gain nothing from compression
+MIN_SIZE = 1024
+
+def find_text_assets(root=BASE_DIR):
+    """Yield paths of compressible files under root"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                yield os.path.join(dirpath, filename)
+
+def is_up_to_date(source, target):
+    """True if target exists and is at least as new as source"""
+    try:
+        return os.stat(target).st_mtime_ns >= os.stat(source).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+def compress_gzip(data):
+    # mtime=0 keeps the output byte-identical across builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def compress_brotli(data):
+    return brotli.compress(data, quality=11)
+
+def available_compressors():
+    """(suffix, compress function) pairs usable in this environment"""
+    compressors = [('.gz', compress_gzip)]
+    if brotli is not None:
+        compressors.insert(0, ('.br', compress_brotli))
+    return compressors
+
+def compress_file(path, force=False):
+    """Write compressed variants of one file; returns the number written"""
+    written = 0
+    data = None
+    for suffix, compress in available_compressors():
+        target = path + suffix
+        if not force and is_up_to_date(path, target):
+            continue
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        if len(data) < MIN_SIZE:
+            return written
+        compressed = compress(data)
+        if len(compressed) >= len(data):
+            # Not worth serving; make sure no stale variant is left behind
+            if os.path.exists(target):
+                os.remove(target)
+            continue
+        with open(target, 'wb') as f:
+            f.write(compressed)
+        written += 1
+    return written
+
+def compress_site(root=BASE_DIR, force=False):
+    """Compress every text asset under root; returns (files seen, variants written)"""
+    seen = 0
+    written = 0
+    for path in find_text_assets(root):
+        seen += 1
+        written += compress_file(path, force=force)
+    return seen, written
+
+def main():
+    parser = argparse.ArgumentParser(description='Write .gz/.br variants of text assets')
+    parser.add_argument('--force', action='store_true',
+                        help='recompress even if the variants are up to date')
+    args = parser.parse_args()
+
+    print("Precompressing text assets...")
+    if brotli is None:
+        print("- brotli module not installed, writing gzip variants only")
+    seen, written = compress_site(force=args.force)
+    print(f"Checked {seen} text assets, wrote {written} compressed variants")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Find duplicate photos in Instagram Aktif/ and images/gallery/
+Every image gets a 128-bit perceptual hash (a difference hash of a small
+grayscale copy, decoded at reduced JPEG scale) computed on a process pool
+and kept in the entry cache, so only new or edited files are decoded again.
+The hashes go into a BK-tree, and each image looks up its near matches
+within --distance bits instead of being compared with every other image.
+Prints the groups of duplicates; with --link, byte-identical copies are
+replaced by hard links to the first file with the same bytes. Photos that
+only look alike are reported, never linked.
+Requires Pillow (pip install Pillow).
+Usage: python dedup_images.py [--distance N] [--jobs N] [--link]
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from build_manifest import hash_file
+from entry_cache import EntryCache
+from image_index import GALLERY_DIR, find_gallery_images, to_url
+from matching import DisjointSet
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INSTAGRAM_DIR = os.path.join(BASE_DIR, 'Instagram Aktif')
+
+# Searched in this order; the first copy of a photo found is the one kept,
+# so the deployed gallery copy wins over the Instagram export
+IMAGE_DIRS = [GALLERY_DIR, INSTAGRAM_DIR]
+
+HASH_SIZE = 8           # 8x8 gradient bits in each direction
+MAX_DISTANCE = 10       # differing bits (of 128) for two hashes to count as the same photo
+
+def gradient_bits(pixels, width, step):
+    """One bit per pixel pair step bytes apart: is the first one brighter"""
+    bits = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            index = row * width + col
+            bits = bits << 1 | (pixels[index] > pixels[index + step])
+    return bits
+
+def perceptual_hash(path):
+    """128-bit difference hash: horizontal then vertical brightness gradients"""
+    with Image.open(path) as img:
+        img.draft('L', (HASH_SIZE * 8, HASH_SIZE * 8))
+        img = ImageOps.exif_transpose(img).convert('L')
+    across = img.resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS).tobytes()
+    down = img.resize((HASH_SIZE, HASH_SIZE + 1), Image.LANCZOS).tobytes()
+    # Rows alone give skies and sunsets near-identical hashes; columns tell them apart
+    return (gradient_bits(across, HASH_SIZE + 1, 1) << HASH_SIZE * HASH_SIZE
+            | gradient_bits(down, HASH_SIZE, HASH_SIZE))
+
+def image_hashes(path):
+    """Worker: perceptual and content hash of one image"""
+    # JSON keeps the 128-bit hash exactly only as a string
+    return {'phash': f'{perceptual_hash(path):032x}', 'sha256': hash_file(path)}
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+class BKTree:
+    """Burkhard-Keller tree of hashes under the Hamming distance
+
+    Children are keyed by their distance to the parent, so by the triangle
+    inequality a search within radius r only descends into children at
+    distance d - r to d + r from each visited node.
+    """
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value, item):
+        node = [value, [item], {}]
+        if self.root is None:
+            self.root = node
+            return
+        current = self.root
+        while True:
+            distance = hamming(value, current[0])
+            if distance == 0:
+                current[1].append(item)
+                return
+            if distance not in current[2]:
+                current[2][distance] = node
+                return
+            current = current[2][distance]
+
+    def search(self, value, radius):
+        """Items whose value is within radius of the given one"""
+        found = []
+        todo = [self.root] if self.root is not None else []
+        while todo:
+            node_value, items, children = todo.pop()
+            distance = hamming(value, node_value)
+            if distance <= radius:
+                found.extend(items)
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    todo.append(child)
+        return found
+
+def find_images():
+    """Paths of every image in IMAGE_DIRS, in keep-first order"""
+    return [os.path.join(image_dir, name) for image_dir in IMAGE_DIRS if os.path.isdir(image_dir)
+            for name in find_gallery_images(image_dir)]
+
+def hash_images(paths, jobs=None):
+    """Hashes of every image, decoding only those the cache does not have"""
+    entries = {}
+    for path in paths:
+        fs = os.stat(path)
+        entries[path] = (to_url(path), str(fs.st_mtime_ns), str(fs.st_size))
+
+    with EntryCache('dedup_images', [__file__]) as cache:
+        missing = {parts[0] for parts in cache.missing(entries.values())}
+        computed = {}
+        if missing:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = {path: pool.submit(image_hashes, path)
+                           for path, parts in entries.items() if parts[0] in missing}
+                computed = {path: future.result() for path, future in futures.items()}
+        hashes = {path: cache.get(parts, lambda: computed[path]) for path, parts in entries.items()}
+    print(f"Hash cache: {cache.summary()}")
+    return hashes
+
+def find_duplicates(paths, hashes, distance=MAX_DISTANCE):
+    """Groups of paths showing the same photo, each in keep-first order"""
+    tree = BKTree()
+    groups = DisjointSet(len(paths))
+    for index, path in enumerate(paths):
+        value = int(hashes[path]['phash'], 16)
+        for match in tree.search(value, distance):
+            groups.union(match, index)
+        tree.add(value, index)
+
+    members_by_root = {}
+    for index in range(len(paths)):
+        members_by_root.setdefault(groups.find(index), []).append(paths[index])
+    return [members for members in members_by_root.values() if len(members) > 1]
+
+def identical_copies(group, hashes):
+    """Map each file in a group to the first earlier file with the same bytes"""
+    first_with_content = {}
+    copies = {}
+    for path in group:
+        first = first_with_content.setdefault(hashes[path]['sha256'], path)
+        if first != path:
+            copies[path] = first
+    return copies
+
+def link_duplicates(group, hashes):
+    """Hard-link the byte-identical copies in a group to the file they copy
+
+    Returns the number of files linked and the bytes freed.
+    """
+    linked = freed = 0
+    for path, original in identical_copies(group, hashes).items():
+        fs = os.stat(path)
+        if fs.st_ino == os.stat(original).st_ino:
+            continue
+        # Link under a temporary name first so the copy is never missing
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        os.link(original, tmp_path)
+        os.replace(tmp_path, path)
+        linked += 1
+        if fs.st_nlink == 1:
+            freed += fs.st_size
+    return linked, freed
+
+def megabytes(size):
+    return f"{size / (1024 * 1024):.1f} MB"
+
+def main():
+    parser = argparse.ArgumentParser(description='Find duplicate photos by perceptual hash')
+    parser.add_argument('--distance', type=int, default=MAX_DISTANCE,
+                        help=f'differing hash bits still counted as a duplicate (default: {MAX_DISTANCE})')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='worker processes (default: number of CPUs)')
+    parser.add_argument('--link', action='store_true',
+                        help='replace byte-identical copies with hard links to one file')
+    args = parser.parse_args()
+
+    if Image is None:
+        print("Error: Pillow is required to hash images (pip install Pillow)")
+        sys.exit(1)
+
+    print("Looking for duplicate photos...")
+    paths = find_images()
+    hashes = hash_images(paths, jobs=args.jobs)
+    duplicates = find_duplicates(paths, hashes, args.distance)
+
+    identical = similar = duplicate_bytes = 0
+    for group in duplicates:
+        copies = identical_copies(group, hashes)
+        print(f"- {to_url(group[0])}")
+        for path in group[1:]:
+            duplicate_bytes += os.path.getsize(path)
+            if path in copies:
+                identical += 1
+                print(f"    identical: {to_url(path)} (same bytes as {to_url(copies[path])})")
+            else:
+                similar += 1
+                print(f"    similar: {to_url(path)}")
+    print(f"{len(paths)} images, {len(paths) - identical - similar} distinct photos in "
+          f"{len(duplicates)} duplicate groups: {identical} identical and {similar} similar copies "
+          f"({megabytes(duplicate_bytes)})")
+
+    if args.link:
+        linked = freed = 0
+        for group in duplicates:
+            group_linked, group_freed = link_duplicates(group, hashes)
+            linked += group_linked
+            freed += group_freed
+        print(f"Hard-linked {linked} identical copies, freeing {megabytes(freed)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Find publications listed more than once in publications_data.json
+The same work often appears in two sections (a report that became a journal
+article) or once with a year and once in the 'unknown' bucket. Records are
+linked when they share a DOI or when their titles are near-duplicates.
+Titles are compared through MinHash signatures bucketed by LSH bands, so
+only records landing in a common bucket are ever compared and the stage
+stays close to linear in the number of publications.
+Prints the merged groups and writes a report with every record, the merged
+records and the links between them to .build/publications_dedup.json for
+review; no other stage or page reads it.
+Usage: python dedup_publications.py [--force]
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from functools import lru_cache
+
+import matching
+from build_manifest import MANIFEST_DIR, is_stage_current, record_stage, write_if_changed
+from matching import DOI_PATTERN, DisjointSet, fold_text
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PUBLICATIONS_JSON_PATH = os.path.join(BASE_DIR, 'publications_data.json')
+DEDUP_JSON_PATH = os.path.join(MANIFEST_DIR, 'publications_dedup.json')
+
+# Titles are quoted: “...” or "..."
+TITLE_PATTERN = re.compile(r'[“"]([^”"]{10,})[”"]')
+
+SHINGLE_SIZE = 4        # characters per shingle
+BANDS = 16
+ROWS = 4                # values per band
+SIGNATURE_SIZE = BANDS * ROWS
+BIN_RANGE = 1 << 58     # shingle hashes are split into a bin (high bits) and a value
+SIMILARITY = 0.8        # Jaccard similarity for two titles to count as the same work
+MIN_SHINGLES = 8        # shorter titles are too ambiguous to match on
+
+# When merging, the most formal version of a work represents it
+CATEGORY_RANK = {'journal': 0, 'book': 1, 'chapter': 2, 'report': 3, 'conference': 4}
+
+def normalize_doi(doi):
+    """DOIs are case-insensitive; drop the sentence's closing period"""
+    return doi.rstrip('.;').lower()
+
+def extract_title(text):
+    """The quoted title, or the whole entry when there is none"""
+    match = TITLE_PATTERN.search(text)
+    title = match.group(1) if match else DOI_PATTERN.sub('', text)
+    return title.strip(' ,.')
+
+def shingles(title):
+    """Character shingles of a title folded like the site search"""
+    words = ' '.join(re.findall(r'[^\W_]+', fold_text(title)))
+    return {words[i:i + SHINGLE_SIZE] for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+@lru_cache(maxsize=1 << 16)
+def shingle_hash(shingle):
+    """Stable 64-bit hash (hash() is salted per process)"""
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def minhash(shingle_set):
+    """One-permutation MinHash signature of a shingle set
+
+    Each shingle hash falls into one of SIGNATURE_SIZE bins, which keep
+    their smallest value, so a title is hashed once rather than once per
+    signature value. Empty bins borrow from the next filled bin, offset
+    by the distance, as in densified one-permutation hashing.
+    """
+    signature = [None] * SIGNATURE_SIZE
+    for shingle in shingle_set:
+        slot, value = divmod(shingle_hash(shingle), BIN_RANGE)
+        slot %= SIGNATURE_SIZE
+        if signature[slot] is None or value < signature[slot]:
+            signature[slot] = value
+
+    # Walk right to left twice around so every empty bin sees its next filled one
+    nearest = None
+    for position in range(2 * SIGNATURE_SIZE - 1, -1, -1):
+        slot = position % SIGNATURE_SIZE
+        value = signature[slot]
+        if value is not None and value < BIN_RANGE:
+            nearest = (position, value)
+        elif value is None and position < SIGNATURE_SIZE:
+            signature[slot] = nearest[1] + (nearest[0] - position) * BIN_RANGE
+    return signature
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+def load_records(data):
+    """Flatten the year buckets into records with sequential ids"""
+    records = []
+    for year, year_pubs in data['publications'].items():
+        for pub in year_pubs:
+            doi = DOI_PATTERN.search(pub['text'])
+            records.append({
+                'id': len(records),
+                'year': pub['year'],
+                'category': pub['category'],
+                'title': extract_title(pub['text']),
+                'doi': normalize_doi(doi.group(1)) if doi else None,
+                'text': pub['text'],
+            })
+    return records
+
+def link_by_doi(records, groups, reasons):
+    first_with_doi = {}
+    for record in records:
+        if record['doi'] is None:
+            continue
+        first = first_with_doi.setdefault(record['doi'], record['id'])
+        if first != record['id'] and groups.union(first, record['id']):
+            reasons[(first, record['id'])] = 'doi'
+
+def link_by_title(records, groups, reasons):
+    """Link near-duplicate titles found through LSH buckets
+
+    Each bucket compares its records with the first one in it only, so
+    work is linear in bucket size; pairs missed that way share a bucket
+    in another band or are joined transitively.
+    """
+    shingle_sets = {}
+    buckets = {}
+    for record in records:
+        shingle_set = shingles(record['title'])
+        if len(shingle_set) < MIN_SHINGLES:
+            continue
+        shingle_sets[record['id']] = shingle_set
+        signature = minhash(shingle_set)
+        for band in range(BANDS):
+            key = (band, *signature[band * ROWS:(band + 1) * ROWS])
+            buckets.setdefault(key, []).append(record['id'])
+
+    for members in buckets.values():
+        leader = members[0]
+        for other in members[1:]:
+            if groups.find(leader) == groups.find(other):
+                continue
+            if jaccard(shingle_sets[leader], shingle_sets[other]) >= SIMILARITY:
+                groups.union(leader, other)
+                reasons[(leader, other)] = 'title'
+
+def canonical_key(record):
+    """Sort key putting the record that should represent its group first"""
+    return (record['doi'] is None, CATEGORY_RANK.get(record['category'], len(CATEGORY_RANK)),
+            record['year'] == 'unknown', -len(record['text']), record['id'])
+
+def merge_groups(records, groups, reasons):
+    """Build one merged record per group of duplicates"""
+    members_by_root = {}
+    for record in records:
+        members_by_root.setdefault(groups.find(record['id']), []).append(record)
+    links_by_root = {}
+    for (a, b), reason in sorted(reasons.items()):
+        links_by_root.setdefault(groups.find(a), []).append({'from': a, 'to': b, 'match': reason})
+
+    merged = []
+    for root, members in members_by_root.items():
+        if len(members) < 2:
+            continue
+        canonical = min(members, key=canonical_key)
+        member_ids = [record['id'] for record in members]
+        years = [record['year'] for record in members if record['year'] != 'unknown']
+        merged.append({
+            'id': len(merged),
+            'canonical': canonical['id'],
+            'title': canonical['title'],
+            'text': canonical['text'],
+            'year': max(years) if years else 'unknown',
+            'categories': sorted({record['category'] for record in members}, key=CATEGORY_RANK.get),
+            'dois': sorted({record['doi'] for record in members if record['doi']}),
+            'members': member_ids,
+            'links': links_by_root[root],
+        })
+        for record in members:
+            record['merged_into'] = merged[-1]['id']
+    return merged
+
+def deduplicate(data):
+    """Find duplicate publications; returns the report structure"""
+    records = load_records(data)
+    groups = DisjointSet(len(records))
+    reasons = {}
+    link_by_doi(records, groups, reasons)
+    link_by_title(records, groups, reasons)
+    merged = merge_groups(records, groups, reasons)
+    for record in records:
+        record.setdefault('merged_into', None)
+    return {
+        'total_count': len(records),
+        'unique_count': len(records) - sum(len(group['members']) - 1 for group in merged),
+        'merged': merged,
+        'records': records,
+    }
+
+def stage_inputs():
+    """Files this stage reads"""
+    return [PUBLICATIONS_JSON_PATH, __file__, matching.__file__]
+
+def main(force=False):
+    """Find duplicate publications and save the merged records"""
+    inputs = stage_inputs()
+    outputs = [DEDUP_JSON_PATH]
+    if not force and is_stage_current('dedup_publications', inputs, outputs):
+        print("publications_data.json unchanged - skipping deduplication")
+        return False
+
+    print("Looking for duplicate publications...")
+    with open(PUBLICATIONS_JSON_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    result = deduplicate(data)
+
+    write_if_changed(DEDUP_JSON_PATH, json.dumps(result, ensure_ascii=False, indent=2))
+    record_stage('dedup_publications', inputs, outputs)
+
+    print(f"{result['total_count']} publications, {result['unique_count']} distinct works "
+          f"in {len(result['merged'])} merged groups")
+    for group in result['merged'][:10]:
+        print(f"- {group['title'][:70]} ({', '.join(group['categories'])}, "
+              f"{len(group['members'])} entries)")
+    print(f"Deduplicated publications saved to: {DEDUP_JSON_PATH}")
+    return True
+
+if __name__ == "__main__":
+    main(force='--force' in sys.argv[1:])
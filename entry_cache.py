@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistent per-entry cache shared by the publication build stages
+Stages keep what they compute for each CV entry (parsed fields, rendered
+HTML) in .build/entries.sqlite, keyed by a hash of the entry and of the
+code that processed it, so a rebuild only redoes new or edited entries.
+When a stage finishes a run, rows that run did not use are deleted, which
+drops edited and removed entries as well as everything computed by an
+older version of the code.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+
+import build_manifest
+
+DATABASE_NAME = 'entries.sqlite'
+
+class EntryCache:
+    """Cached results of one stage, used as a context manager around a run"""
+
+    def __init__(self, stage, code_paths):
+        self.stage = stage
+        # Editing the code that computes the values invalidates them all
+        version = hashlib.blake2b(digest_size=16)
+        for path in code_paths:
+            with open(path, 'rb') as f:
+                version.update(f.read())
+        self.version = version.digest()
+        self.connection = None
+        self.stored = {}
+        self.used = set()
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+        self.removed = 0
+
+    def __enter__(self):
+        os.makedirs(build_manifest.MANIFEST_DIR, exist_ok=True)
+        path = os.path.join(build_manifest.MANIFEST_DIR, DATABASE_NAME)
+        # Stages may run in parallel processes; wait for each other's writes
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' stage TEXT NOT NULL, key BLOB NOT NULL, value TEXT NOT NULL,'
+            ' PRIMARY KEY (stage, key)) WITHOUT ROWID')
+        # One query for the whole stage: far cheaper than a lookup per entry
+        self.stored = dict(self.connection.execute(
+            'SELECT key, value FROM entries WHERE stage = ?', (self.stage,)))
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            # Only a complete run knows which rows are still needed
+            if exc_type is None:
+                self.commit()
+        finally:
+            self.connection.close()
+            self.connection = None
+
+    def key(self, parts):
+        digest = hashlib.blake2b(self.version, digest_size=16)
+        for part in parts:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.digest()
+
+    def get(self, parts, compute):
+        """Cached value for an entry (a tuple of strings), computing it on a miss
+
+        Values must be JSON-serializable.
+        """
+        key = self.key(parts)
+        self.used.add(key)
+        value = self.stored.get(key) or self.pending.get(key)
+        if value is not None:
+            self.hits += 1
+            return json.loads(value)
+        self.misses += 1
+        value = compute()
+        self.pending[key] = json.dumps(value, ensure_ascii=False)
+        return value
+
+    def missing(self, entries):
+        """The entries (tuples of strings) that have no cached value yet
+
+        Lets a stage compute the misses in bulk, e.g. on a process pool,
+        before reading every entry through get().
+        """
+        missing = []
+        for parts in entries:
+            key = self.key(parts)
+            if key not in self.stored and key not in self.pending:
+                missing.append(parts)
+        return missing
+
+    def memoize(self, function):
+        """Wrap a function of string arguments so its results are cached"""
+        return lambda *args: self.get((function.__name__, *args), lambda: function(*args))
+
+    def commit(self):
+        """Store new values and delete the rows this run did not use"""
+        stale = self.stored.keys() - self.used
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO entries (stage, key, value) VALUES (?, ?, ?)',
+                [(self.stage, key, value) for key, value in self.pending.items()])
+            self.connection.executemany(
+                'DELETE FROM entries WHERE stage = ? AND key = ?',
+                [(self.stage, key) for key in stale])
+        self.removed = len(stale)
+        self.stored.update(self.pending)
+        for key in stale:
+            del self.stored[key]
+        self.pending.clear()
+
+    def summary(self):
+        return f"{self.misses} entries processed, {self.hits} cached, {self.removed} stale removed"
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Single-pass HTML formatter for CV entries
+Each category's markup rules (author highlighting, book titles, DOI links,
+funding organizations) are compiled once into a single alternation. One
+scan over the raw text emits every match as markup and escapes the plain
+text between matches, instead of escaping the whole entry and then running
+a re.sub per rule. Results are memoized per (text, category).
+"""
+
+import re
+from functools import lru_cache
+from html import escape
+
+# Markup rules by name. Each pattern matches the raw entry text; escaping
+# never adds commas, whitespace or word characters, so the matches are the
+# ones the same patterns would find in the escaped text.
+RULES = {
+    'author': r'\b(?:Selim Çağatay|S\. Çağatay|Çağatay, S\.?|Cagatay, S\.?)\b',
+    # "in <book title>," in book chapters
+    'book': r'\bin\s+(?P<book_title>[^,]+),',
+    'doi': r'DOI:\s*(?P<doi_id>10\.\d+/[^\s,]+)',
+    'organization': (r'\b(?:TÜBİTAK|BAKA|ICMPD|AFAD|EU|Akdeniz|OSB|ATSO|EBRD|FEMISE'
+                     r'|OECD|UNDP|World Bank|FAO)\b'),
+}
+
+# Rules applied to each category, in priority order. Quoted titles are not
+# emphasized: the old per-rule formatters looked for '"' after escaping had
+# already turned it into '&quot;', so that rule never matched.
+CATEGORY_RULES = {
+    'chapter': ['author', 'book', 'doi'],
+    'grant': ['author', 'organization'],
+}
+DEFAULT_RULES = ['author', 'doi']
+
+# Inside a book title only these rules apply
+BOOK_TITLE_RULES = ['author', 'doi']
+
+@lru_cache(maxsize=None)
+def compile_rules(names):
+    return re.compile('|'.join(f'(?P<{name}>{RULES[name]})' for name in names))
+
+def render_match(match):
+    kind = match.lastgroup
+    if kind == 'book':
+        return f"in <em>{format_with(match.group('book_title'), BOOK_TITLE_RULES)}</em>,"
+    if kind == 'doi':
+        doi = escape(match.group('doi_id'))
+        return f'DOI: <a href="https://doi.org/{doi}" target="_blank">{doi}</a>'
+    return f"<strong>{escape(match.group())}</strong>"
+
+def format_with(text, rule_names):
+    """Escape text and mark up every match of the rules in one scan"""
+    pattern = compile_rules(tuple(rule_names))
+    parts = []
+    position = 0
+    for match in pattern.finditer(text):
+        parts.append(escape(text[position:match.start()]))
+        parts.append(render_match(match))
+        position = match.end()
+    parts.append(escape(text[position:]))
+    return ''.join(parts)
+
+@lru_cache(maxsize=1 << 14)
+def format_entry(text, category):
+    """HTML for a CV entry of the given category ('journal', ..., 'grant')"""
+    return format_with(text, CATEGORY_RULES.get(category, DEFAULT_RULES))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fingerprint static assets with their content hash
+Copies every stylesheet and script to a name carrying a hash of its bytes
+(css/style.css -> css/style.3f9a0c1b2d.css) and points the references in
+the hand-written pages and the page templates at those copies, so the
+generated pages pick them up too. A fingerprinted file never changes, which
+lets server.py mark it immutable; editing an asset gives it a new name.
+Copies from earlier versions are removed and asset-manifest.json maps each
+asset to its current fingerprinted name.
+Usage: python fingerprint_assets.py [--force]
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+
+from build_manifest import is_stage_current, record_stage, write_if_changed
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_MANIFEST_PATH = os.path.join(BASE_DIR, 'asset-manifest.json')
+
+# Source assets, relative to BASE_DIR
+ASSET_PATTERNS = ['css/*.css', 'js/*.js']
+
+# Pages whose references are rewritten: every top-level page and the
+# templates the generators render from
+PAGE_PATTERNS = ['*.html', 'templates/*.html', 'templates/partials/*.html']
+
+FINGERPRINT_LENGTH = 10
+
+# A fingerprinted file name: name.<hash>.ext
+FINGERPRINT_PATTERN = re.compile(r'\.[0-9a-f]{%d}\.\w+$' % FINGERPRINT_LENGTH)
+
+# Variants compress_assets.py writes next to a file
+COMPRESSED_SUFFIXES = ['.gz', '.br']
+
+def find_assets(root=BASE_DIR):
+    """Relative paths of the source assets (fingerprinted copies excluded)"""
+    paths = []
+    for pattern in ASSET_PATTERNS:
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            if not FINGERPRINT_PATTERN.search(path):
+                paths.append(os.path.relpath(path, root).replace(os.sep, '/'))
+    return paths
+
+def find_pages(root=BASE_DIR):
+    return [path for pattern in PAGE_PATTERNS
+            for path in sorted(glob.glob(os.path.join(root, pattern)))]
+
+def fingerprinted_name(asset, data):
+    stem, extension = os.path.splitext(asset)
+    digest = hashlib.sha256(data).hexdigest()[:FINGERPRINT_LENGTH]
+    return f'{stem}.{digest}{extension}'
+
+def reference_pattern(asset):
+    """Matches an href/src value naming the asset, fingerprinted or not
+
+    Any query string (e.g. a hand-maintained ?v=2.0.0) is part of the match,
+    since the fingerprint replaces it.
+    """
+    stem, extension = os.path.splitext(asset)
+    return re.compile(
+        r'''(?P<prefix>(?:href|src)=["'](?:\.?/)?)'''
+        + re.escape(stem) + r'(?:\.[0-9a-f]{%d})?' % FINGERPRINT_LENGTH + re.escape(extension)
+        + r'''(?:\?[^"'#]*)?(?=["'#])''')
+
+def rewrite_references(text, fingerprints):
+    """Point every asset reference in a page at its fingerprinted name"""
+    for asset, name in fingerprints.items():
+        text = reference_pattern(asset).sub(lambda match: match.group('prefix') + name, text)
+    return text
+
+def remove_stale_copies(fingerprints, root=BASE_DIR):
+    """Delete fingerprinted copies (and their compressed variants) no longer in use"""
+    current = {os.path.join(root, name) for name in fingerprints.values()}
+    removed = 0
+    for pattern in ASSET_PATTERNS:
+        for path in glob.glob(os.path.join(root, pattern)):
+            if FINGERPRINT_PATTERN.search(path) and path not in current:
+                os.remove(path)
+                removed += 1
+                for suffix in COMPRESSED_SUFFIXES:
+                    if os.path.exists(path + suffix):
+                        os.remove(path + suffix)
+    return removed
+
+def read_assets():
+    """Bytes of every source asset by relative path"""
+    contents = {}
+    for asset in find_assets():
+        with open(os.path.join(BASE_DIR, asset), 'rb') as f:
+            contents[asset] = f.read()
+    return contents
+
+def stage_inputs():
+    """Files this stage reads"""
+    return [os.path.join(BASE_DIR, asset) for asset in find_assets()] + find_pages() + [__file__]
+
+def main(force=False):
+    """Fingerprint the assets and rewrite the pages that reference them"""
+    contents = read_assets()
+    fingerprints = {asset: fingerprinted_name(asset, data) for asset, data in contents.items()}
+    inputs = stage_inputs()
+    outputs = [ASSET_MANIFEST_PATH] + [os.path.join(BASE_DIR, name) for name in fingerprints.values()]
+    if not force and is_stage_current('fingerprint_assets', inputs, outputs):
+        print("Assets and pages unchanged - skipping fingerprinting")
+        return False
+
+    print("Fingerprinting static assets...")
+    for asset, name in fingerprints.items():
+        path = os.path.join(BASE_DIR, name)
+        # Same name, same bytes: an existing copy is already right
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(contents[asset])
+
+    rewritten = 0
+    for page in find_pages():
+        with open(page, 'r', encoding='utf-8') as f:
+            text = f.read()
+        rewritten += write_if_changed(page, rewrite_references(text, fingerprints))
+
+    removed = remove_stale_copies(fingerprints)
+    write_if_changed(ASSET_MANIFEST_PATH, json.dumps(fingerprints, indent=2, sort_keys=True) + '\n')
+    # Pages were rewritten in place: record them as they are now
+    record_stage('fingerprint_assets', stage_inputs(), outputs)
+
+    for asset, name in fingerprints.items():
+        print(f"- {asset} -> {name}")
+    print(f"{rewritten} pages rewritten, {removed} stale copies removed")
+    print(f"Asset manifest saved to: {ASSET_MANIFEST_PATH}")
+    return True
+
+if __name__ == "__main__":
+    main(force='--force' in sys.argv[1:])
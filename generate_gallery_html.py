@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generate gallery.html from the photos in images/gallery/
+Every photo gets its intrinsic width and height, loading="lazy",
+decoding="async" and a tiny inline placeholder (a few pixels wide WebP)
+painted behind it until it loads. Photos are shown newest first, with
+capture years, sizes and orientation taken from the header index of
+image_index.py; placeholders are decoded at reduced scale and kept in the
+entry cache, so only new or edited photos are read again. The grid loads
+the resized copies listed in images/derivatives/manifest.json through
+srcset and sizes; the original is only fetched for the lightbox. The first
+GALLERY_BATCH_SIZE photos are in the page markup, later ones wait in
+<template> batches that the page attaches as the visitor scrolls.
+Requires Pillow (pip install Pillow).
+Usage: python generate_gallery_html.py [--force]
+"""
+
+import base64
+import io
+import os
+import sys
+from html import escape
+
+import generate_image_derivatives
+import image_index
+from build_manifest import is_stage_current, open_if_changed, record_stage
+from entry_cache import EntryCache
+from site_templates import render_page, template_files
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GALLERY_HTML_PATH = os.path.join(BASE_DIR, 'gallery.html')
+
+GALLERY_BATCH_SIZE = 24
+
+# Displayed width of a grid photo: one column on phones, two on tablets,
+# three in the 1200px container
+GRID_IMAGE_SIZES = '(max-width: 768px) 100vw, (max-width: 1200px) 50vw, 360px'
+
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_QUALITY = 30
+
+# Photos take turns in these categories, as on the hand-made page
+CATEGORIES = [
+    ('conferences', 'Conference Presentation'),
+    ('research', 'Research Activity'),
+    ('teaching', 'Teaching Activity'),
+    ('events', 'Academic Event'),
+    ('awards', 'Recognition Event'),
+]
+
+def placeholder_format():
+    return ('WEBP', 'image/webp') if features.check('webp') else ('JPEG', 'image/jpeg')
+
+def placeholder(path):
+    """data: URL of a PLACEHOLDER_WIDTH pixel wide version of an image"""
+    image_format, mime_type = placeholder_format()
+    with Image.open(path) as img:
+        # JPEGs are decoded at 1/8 scale or less instead of in full
+        img.draft('RGB', (PLACEHOLDER_WIDTH * 4, PLACEHOLDER_WIDTH * 4))
+        img = ImageOps.exif_transpose(img).convert('RGB')
+    img.thumbnail((PLACEHOLDER_WIDTH, PLACEHOLDER_WIDTH))
+    data = io.BytesIO()
+    img.save(data, image_format, quality=PLACEHOLDER_QUALITY)
+    return f'data:{mime_type};base64,{base64.b64encode(data.getvalue()).decode("ascii")}'
+
+def gallery_photos(cache):
+    """Every gallery photo with its page metadata, newest capture first"""
+    images = image_index.gallery_index()[0]
+    derivatives = generate_image_derivatives.load_manifest()['images']
+    photos = []
+    for index, url in enumerate(image_index.capture_order(images)):
+        entry = images[url]
+        path = os.path.join(BASE_DIR, url)
+        width, height = image_index.displayed_size(entry)
+        category, label = CATEGORIES[index % len(CATEGORIES)]
+        # Photos added since the derivatives were built show the original
+        variants = derivatives.get(url, {}).get('variants')
+        photos.append({
+            'src': variants[0]['src'] if variants else url,
+            'srcset': derivatives[url]['srcset'] if variants else None,
+            'full': url,
+            'width': width,
+            'height': height,
+            'placeholder': cache.get((url, str(entry['mtime_ns']), str(entry['size'])),
+                                     lambda: placeholder(path)),
+            'category': category,
+            'alt': f"{label} {index // len(CATEGORIES) + 1}",
+            # Photos without EXIF dates show no year
+            'year': entry['captured'][:4] if entry['captured'] else None,
+        })
+    return photos
+
+def write_photo(write, photo):
+    src = escape(photo['src'])
+    srcset = (f'\n                                 srcset="{escape(photo["srcset"])}" sizes="{GRID_IMAGE_SIZES}"'
+              if photo['srcset'] else '')
+    year_attribute = f' data-year="{photo["year"]}"' if photo['year'] else ''
+    year_caption = f'''
+                                    <p>{photo['year']}</p>''' if photo['year'] else ''
+    write(f'''
+                    <div class="gallery-item" data-category="{photo['category']}"{year_attribute}>
+                        <div class="gallery-image-wrapper">
+                            <img src="{src}" alt="{escape(photo['alt'])}" class="gallery-image"{srcset}
+                                 width="{photo['width']}" height="{photo['height']}" loading="lazy" decoding="async"
+                                 data-full="{escape(photo['full'])}" style="background-image: url({photo['placeholder']})">
+                            <div class="gallery-overlay">
+                                <div class="gallery-info">{year_caption}
+                                </div>
+                                <button class="gallery-btn" onclick="openLightbox(this)" aria-label="View full size">
+                                    <span class="btn-icon">🔍</span>
+                                </button>
+                            </div>
+                        </div>
+                    </div>''')
+
+def write_gallery_grid(write, photos):
+    """The first batch of photos, then the later ones as <template> batches"""
+    write('''
+                <div class="gallery-grid" id="galleryGrid">''')
+    for photo in photos[:GALLERY_BATCH_SIZE]:
+        write_photo(write, photo)
+    for start in range(GALLERY_BATCH_SIZE, len(photos), GALLERY_BATCH_SIZE):
+        write('''
+                    <template class="gallery-batch">''')
+        for photo in photos[start:start + GALLERY_BATCH_SIZE]:
+            write_photo(write, photo)
+        write('''
+                    </template>''')
+    write('''
+                </div>''')
+
+def write_main(write, photos):
+    """Write the gallery page's main content"""
+    write('''
+        <!-- Page Header -->
+        <section class="page-header">
+            <div class="container">
+                <h1 class="page-title">Photo Gallery</h1>
+                <p class="page-subtitle">Personal Photos and Memorable Moments</p>
+            </div>
+        </section>
+
+        <!-- Photo Carousel -->
+        <section class="photo-carousel-section">
+            <div class="container">
+                <div class="carousel-container">
+                    <div class="carousel-wrapper">
+                        <div class="carousel-track" id="carouselTrack">
+                            <!-- Photos will be dynamically loaded here -->
+                        </div>
+                        <button class="carousel-btn carousel-btn-prev" id="carouselPrev" aria-label="Previous photo">
+                            <svg width="24" height="24" viewBox="0 0 24 24" fill="currentColor">
+                                <path d="M15.41 7.41L14 6l-6 6 6 6 1.41-1.41L10.83 12z"/>
+                            </svg>
+                        </button>
+                        <button class="carousel-btn carousel-btn-next" id="carouselNext" aria-label="Next photo">
+                            <svg width="24" height="24" viewBox="0 0 24 24" fill="currentColor">
+                                <path d="M10 6L8.59 7.41 13.17 12l-4.58 4.59L10 18l6-6z"/>
+                            </svg>
+                        </button>
+                    </div>
+                    <div class="carousel-indicators" id="carouselIndicators">
+                        <!-- Indicators will be dynamically loaded here -->
+                    </div>
+                    <div class="carousel-controls">
+                        <button class="carousel-control-btn" id="carouselPlayPause" aria-label="Play/Pause slideshow">
+                            <span class="play-icon">▶</span>
+                            <span class="pause-icon">⏸</span>
+                        </button>
+                        <div class="carousel-progress">
+                            <div class="carousel-progress-bar" id="carouselProgressBar"></div>
+                        </div>
+                    </div>
+                </div>
+            </div>
+        </section>
+
+        <!-- Gallery Grid -->
+        <section class="gallery-section">
+            <div class="container">''')
+    write_gallery_grid(write, photos)
+    write(f'''
+                <!-- Load More Button -->
+                <div class="load-more-container" id="loadMoreContainer"{'' if len(photos) > GALLERY_BATCH_SIZE else ' hidden'}>
+                    <button class="btn btn-primary" id="loadMoreBtn">
+                        Load More Photos
+                    </button>
+                </div>
+            </div>
+        </section>
+
+        <!-- Lightbox Modal -->
+        <div class="lightbox" id="lightbox" onclick="closeLightbox()">
+            <div class="lightbox-content">
+                <button class="lightbox-close" onclick="closeLightbox()" aria-label="Close lightbox">
+                    <span>&times;</span>
+                </button>
+
+                <div class="lightbox-image-container">
+                    <button class="lightbox-nav lightbox-prev" onclick="previousImage()" aria-label="Previous image">
+                        <span>&#8249;</span>
+                    </button>
+
+                    <img id="lightboxImage" class="lightbox-image" src="" alt="">
+
+                    <button class="lightbox-nav lightbox-next" onclick="nextImage()" aria-label="Next image">
+                        <span>&#8250;</span>
+                    </button>
+                </div>
+
+                <div class="lightbox-info">
+                    <h3 id="lightboxTitle" class="lightbox-title"></h3>
+                    <p id="lightboxCaption" class="lightbox-caption"></p>
+                </div>
+            </div>
+        </div>
+
+        <!-- Carousel Modal -->
+        <div class="carousel-modal" id="carouselModal">
+            <div class="carousel-modal-content">
+                <button class="carousel-modal-close" onclick="closeCarouselModal()" aria-label="Close modal">×</button>
+                <img class="carousel-modal-image" id="carouselModalImage" alt="Large view">
+                <div class="carousel-modal-info" id="carouselModalInfo">
+                    <h3 id="carouselModalTitle"></h3>
+                    <p id="carouselModalCaption"></p>
+                </div>
+            </div>
+        </div>''')
+
+BATCH_SCRIPT = '''
+    <script>
+        // Later photos wait in <template> batches; attach the next batch when
+        // the end of the grid comes near or on "Load More Photos"
+        const loadMoreContainer = document.getElementById('loadMoreContainer');
+
+        function renderNextGalleryBatch() {
+            const batch = document.querySelector('#galleryGrid template.gallery-batch');
+            if (batch) {
+                batch.replaceWith(batch.content);
+                // Lightbox and protection handlers for the new photos
+                initializeGalleryImages();
+            }
+            const more = document.querySelector('#galleryGrid template.gallery-batch') !== null;
+            loadMoreContainer.hidden = !more;
+            return more;
+        }
+
+        document.getElementById('loadMoreBtn').addEventListener('click', renderNextGalleryBatch);
+
+        if ('IntersectionObserver' in window) {
+            const batchObserver = new IntersectionObserver(entries => {
+                if (!entries.some(entry => entry.isIntersecting)) {
+                    return;
+                }
+                batchObserver.unobserve(loadMoreContainer);
+                // Observing again reports whether the grid's end is still near
+                if (renderNextGalleryBatch()) {
+                    batchObserver.observe(loadMoreContainer);
+                }
+            }, { rootMargin: '800px 0px' });
+            batchObserver.observe(loadMoreContainer);
+        }
+    </script>'''
+
+def generate_html(write, photos):
+    """Write the complete gallery page"""
+    render_page(
+        write,
+        title='Gallery - Dr. Selim Çağatay',
+        description='Dr. Selim Çağatay - Photo Gallery',
+        keywords='gallery, photos, academic events, conferences, research',
+        active='gallery',
+        main=lambda write: write_main(write, photos),
+        scripts=BATCH_SCRIPT,
+        footer='contact_footer',
+    )
+
+def stage_inputs():
+    """Files this stage reads"""
+    images = [os.path.join(image_index.GALLERY_DIR, name) for name in image_index.find_gallery_images()]
+    return images + [generate_image_derivatives.MANIFEST_PATH, __file__,
+                     image_index.__file__] + template_files()
+
+def main(force=False):
+    """Generate and save the gallery HTML"""
+    if Image is None:
+        raise RuntimeError("Pillow is required to generate gallery.html (pip install Pillow)")
+
+    inputs = stage_inputs()
+    outputs = [GALLERY_HTML_PATH]
+    if not force and is_stage_current('generate_gallery_html', inputs, outputs):
+        print("Gallery photos unchanged - skipping gallery.html")
+        return False
+
+    print("Generating gallery.html...")
+    with EntryCache('generate_gallery_html', [__file__]) as cache:
+        photos = gallery_photos(cache)
+    print(f"Photo cache: {cache.summary()}")
+
+    # Stream the page to disk (left untouched if the bytes are identical)
+    with open_if_changed(GALLERY_HTML_PATH) as f:
+        generate_html(f.write, photos)
+    record_stage('generate_gallery_html', inputs, outputs)
+
+    batches = len(range(GALLERY_BATCH_SIZE, len(photos), GALLERY_BATCH_SIZE))
+    print(f"{len(photos)} photos, {min(len(photos), GALLERY_BATCH_SIZE)} in the page and "
+          f"{batches} batches rendered on demand")
+    print(f"Gallery page generated: {GALLERY_HTML_PATH}")
+    return True
+
+if __name__ == "__main__":
+    try:
+        main(force='--force' in sys.argv[1:])
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
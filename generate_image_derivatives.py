@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generate responsive image derivatives for the photo gallery
+Resizes every image in images/gallery/ to a few bounded widths plus a
+thumbnail on a process pool, and writes images/derivatives/manifest.json
+with the srcset, source size and capture time (the latter two from
+image_index.py) of each image, in gallery order; generate_gallery_html.py
+builds the grid from it. Derivatives are named by the content hash of
+their source, so unchanged images are skipped on rebuild.
+Requires Pillow (pip install Pillow).
+Usage: python generate_image_derivatives.py [--jobs N] [--force]
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from build_manifest import MANIFEST_DIR, hash_file, write_if_changed
+from image_index import (GALLERY_DIR, capture_order, displayed_size, find_gallery_images,
+                         gallery_index, to_url)
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(BASE_DIR, 'images', 'derivatives')
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, 'manifest.json')
+# mtime and size each entry was built from; machine-specific, so kept out of
+# the committed manifest
+STATE_PATH = os.path.join(MANIFEST_DIR, 'image_derivatives.json')
+
+WIDTHS = [480, 960, 1600]
+THUMBNAIL_WIDTH = 240
+JPEG_QUALITY = 82
+# Hex digits of the source hash that derivative names start with
+HASH_LENGTH = 16
+
+def derivative_paths(entry):
+    """All output files an entry refers to"""
+    paths = [variant['src'] for variant in entry['variants']]
+    paths.append(entry['thumbnail']['src'])
+    return [os.path.join(BASE_DIR, src) for src in paths]
+
+def outputs_exist(entry):
+    return all(os.path.exists(path) for path in derivative_paths(entry))
+
+def save_jpeg(image, path):
+    """Write a JPEG atomically so an interrupted build leaves no partial file"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    image.save(tmp_path, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    os.replace(tmp_path, path)
+
+def resize_to_width(image, width):
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.LANCZOS)
+
+def render_derivatives(source_path, digest, output_dir):
+    """Decode one image and write its derivatives; returns the manifest fields"""
+    with Image.open(source_path) as img:
+        # Let the JPEG decoder downscale by DCT while reading; both sides
+        # stay at least as large as the biggest width we need
+        img.draft('RGB', (max(WIDTHS), max(WIDTHS)))
+        img = ImageOps.exif_transpose(img).convert('RGB')
+
+    targets = [width for width in WIDTHS if width < img.width] or [img.width]
+    variants = []
+    current = img
+    # Resize from the largest width down so each step starts from a smaller image
+    for width in sorted(targets, reverse=True):
+        current = resize_to_width(current, width) if width != current.width else current
+        path = os.path.join(output_dir, f'{digest}-{width}w.jpg')
+        save_jpeg(current, path)
+        variants.append({'src': to_url(path), 'width': current.width, 'height': current.height})
+    variants.reverse()
+
+    thumbnail = resize_to_width(current, min(THUMBNAIL_WIDTH, current.width))
+    thumb_path = os.path.join(output_dir, f'{digest}-thumb.jpg')
+    save_jpeg(thumbnail, thumb_path)
+
+    # The source size comes from the image index: img was decoded at reduced scale
+    return {
+        'variants': variants,
+        'thumbnail': {'src': to_url(thumb_path), 'width': thumbnail.width, 'height': thumbnail.height},
+    }
+
+def process_image(source_path, previous, output_dir, force):
+    """Worker: hash one image and render it unless its derivatives already exist"""
+    digest = hash_file(source_path)[:HASH_LENGTH]
+    if not force and previous and previous['hash'] == digest and outputs_exist(previous):
+        entry = {'variants': previous['variants'], 'thumbnail': previous['thumbnail']}
+        rendered = False
+    else:
+        entry = render_derivatives(source_path, digest, output_dir)
+        rendered = True
+    entry['hash'] = digest
+    entry['srcset'] = ', '.join(f"{v['src']} {v['width']}w" for v in entry['variants'])
+    return entry, rendered
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'images': {}}
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def remove_orphans(manifest, output_dir):
+    """Delete derivatives no longer referenced by the manifest"""
+    keep = {os.path.basename(path) for entry in manifest['images'].values()
+            for path in derivative_paths(entry)}
+    keep.add(os.path.basename(MANIFEST_PATH))
+    removed = 0
+    for name in os.listdir(output_dir):
+        if name not in keep:
+            os.remove(os.path.join(output_dir, name))
+            removed += 1
+    return removed
+
+def build_derivatives(jobs=None, force=False):
+    """Bring images/derivatives up to date
+
+    Returns the manifest and the number of images rendered.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is required to generate image derivatives (pip install Pillow)")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    index = gallery_index()[0]
+    previous = load_manifest()['images']
+    previous_state = load_state()
+    images = {}
+    state = {}
+    pending = {}
+
+    for name in find_gallery_images():
+        source_path = os.path.join(GALLERY_DIR, name)
+        key = to_url(source_path)
+        old = previous.get(key)
+        fs = os.stat(source_path)
+        state[key] = {'mtime_ns': fs.st_mtime_ns, 'size': fs.st_size}
+        # Unchanged on disk and outputs present: no need to even hash it
+        old_state = previous_state.get(key, {})
+        if (not force and old and old_state.get('hash') == old['hash']
+                and old_state.get('mtime_ns') == fs.st_mtime_ns
+                and old_state.get('size') == fs.st_size and outputs_exist(old)):
+            images[key] = old
+        else:
+            pending[key] = (source_path, old)
+
+    rendered = 0
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                key: pool.submit(process_image, source_path, old, OUTPUT_DIR, force)
+                for key, (source_path, old) in pending.items()
+            }
+            for key, future in futures.items():
+                images[key], was_rendered = future.result()
+                rendered += was_rendered
+
+    for key, entry in images.items():
+        entry['width'], entry['height'] = displayed_size(index[key])
+        entry['captured'] = index[key]['captured']
+        state[key]['hash'] = entry['hash']
+    manifest = {
+        'widths': WIDTHS,
+        'thumbnail_width': THUMBNAIL_WIDTH,
+        # Gallery order: newest capture first
+        'images': {key: images[key] for key in capture_order(index)},
+    }
+    write_if_changed(MANIFEST_PATH, json.dumps(manifest, ensure_ascii=False, indent=2) + '\n')
+    os.makedirs(MANIFEST_DIR, exist_ok=True)
+    with open(STATE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+    removed = remove_orphans(manifest, OUTPUT_DIR)
+    print(f"Processed {len(images)} gallery images: {rendered} rendered, "
+          f"{len(images) - rendered} unchanged, {removed} stale derivatives removed")
+    return manifest, rendered
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate responsive gallery image derivatives')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='worker processes (default: number of CPUs)')
+    parser.add_argument('--force', action='store_true',
+                        help='re-render every image even if its derivatives exist')
+    args = parser.parse_args()
+
+    print("Generating gallery image derivatives...")
+    try:
+        build_derivatives(jobs=args.jobs, force=args.force)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Manifest saved to: {MANIFEST_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -5,31 +5,33 @@ Generate publications.html with real data from parsed CV
 Updated to include Research Grants navigation
 """
 
+import glob
 import json
+import os
 import re
-from html import escape
+import sys
+from collections import defaultdict
+
+import entry_formatter
+import matching
+from build_manifest import is_stage_current, open_if_changed, record_stage, write_if_changed
+from entry_cache import EntryCache
+from matching import fold_text
+from site_templates import render_page, template_files
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PUBLICATIONS_JSON_PATH = os.path.join(BASE_DIR, 'publications_data.json')
+PUBLICATIONS_HTML_PATH = os.path.join(BASE_DIR, 'publications.html')
+PUBLICATIONS_SHARD_DIR = os.path.join(BASE_DIR, 'publications')
+
+# Sharded output: years after the first screen are written to
+# publications/<year>.html and fetched when scrolled to or filtered on
+SHARD_URL = "publications"
+INLINE_PUBLICATIONS = 12
 
 def format_publication_text(text, category):
     """Format publication text for HTML display"""
-    text = escape(text)
-    
-    # Highlight author name
-    text = re.sub(r'\b(Selim Çağatay|S\. Çağatay|Çağatay, S\.?|Cagatay, S\.?)\b', 
-                  r'<strong>\1</strong>', text)
-    
-    # Format journal/venue names in italics (text in quotes or after "in")
-    if category == 'journal':
-        # Journal names often in italics or after comma
-        text = re.sub(r'"([^"]+)"', r'<em>"\1"</em>', text)
-    elif category == 'chapter':
-        # Book titles after "in"
-        text = re.sub(r'\bin\s+([^,]+),', r'in <em>\1</em>,', text)
-    
-    # Format DOIs as links
-    text = re.sub(r'DOI:\s*(10\.\d+/[^\s,]+)', 
-                  r'DOI: <a href="https://doi.org/\1" target="_blank">\1</a>', text)
-    
-    return text
+    return entry_formatter.format_entry(text, category)
 
 def get_category_display_name(category):
     """Get display name for category"""
@@ -53,85 +55,369 @@ def get_category_icon(category):
     }
     return icons.get(category, '📋')
 
-def generate_html():
-    """Generate the complete HTML for publications page"""
+def listed_years(data):
+    """Years shown on the page with their publications, in page order"""
+    for year in data['years']:
+        year_pubs = data['publications'].get(str(year))
+        if year_pubs:
+            yield year, year_pubs
+
+SEARCH_TOKEN = re.compile(r'[^\W_]+')
+
+def search_tokens(text, category):
+    """Distinct folded words a publication is found by, sorted"""
+    text = f"{get_category_display_name(category)} {text}"
+    return sorted(set(SEARCH_TOKEN.findall(fold_text(text))))
+
+class EntryRenderer:
+    """The per-entry work of the page, optionally through an EntryCache"""
+
+    def __init__(self, cache=None):
+        if cache is None:
+            self.format_text = format_publication_text
+            self.search_tokens = search_tokens
+        else:
+            self.format_text = cache.memoize(format_publication_text)
+            self.search_tokens = cache.memoize(search_tokens)
+
+UNCACHED = EntryRenderer()
+
+def build_search_index(data, entries=UNCACHED):
+    """Inverted index over the listed publications
+
+    Returns the sorted folded tokens and, for each token, the ids of the
+    publications containing it. Ids count publications in page order, as
+    written to their data-id attributes.
+    """
+    postings = defaultdict(list)
+    pub_id = 0
+    for year, year_pubs in listed_years(data):
+        for pub in year_pubs:
+            for token in entries.search_tokens(pub['text'], pub['category']):
+                postings[token].append(pub_id)
+            pub_id += 1
+    tokens = sorted(postings)
+    return {'tokens': tokens, 'postings': [postings[token] for token in tokens]}
+
+def write_search_index(write, data, entries=UNCACHED):
+    """Embed the search index in the page as a JSON data block"""
+    index = json.dumps(build_search_index(data, entries), ensure_ascii=False, separators=(',', ':'))
+    write('\n    <script type="application/json" id="publicationSearchIndex">')
+    write(index.replace('</', '<\\/'))
+    write('</script>')
+
+# Inline search and filter script, placed after js/script.js
+SEARCH_SCRIPT = '''
+    <script>
+        // Enhanced search and filter functionality for publications
+        // Searches look words up in the index embedded by the generator
+        let searchIndex = null;
+
+        function getSearchIndex() {
+            if (!searchIndex) {
+                searchIndex = JSON.parse(document.getElementById('publicationSearchIndex').textContent);
+            }
+            return searchIndex;
+        }
+
+        // Same folding as fold_text in matching.py
+        function foldText(text) {
+            return text.replace(/[İı]/g, 'i').toLowerCase().normalize('NFKD').replace(/\\p{M}/gu, '');
+        }
+
+        // Ids of publications with a word starting with prefix
+        function idsForPrefix(prefix) {
+            const { tokens, postings } = getSearchIndex();
+            let low = 0;
+            let high = tokens.length;
+            while (low < high) {
+                const mid = (low + high) >> 1;
+                if (tokens[mid] < prefix) low = mid + 1;
+                else high = mid;
+            }
+            const ids = new Set();
+            for (let i = low; i < tokens.length && tokens[i].startsWith(prefix); i++) {
+                postings[i].forEach(id => ids.add(id));
+            }
+            return ids;
+        }
+
+        // Ids matching every word of the search term, or null to match all
+        function matchingPublicationIds(searchTerm) {
+            const words = foldText(searchTerm).match(/[\\p{L}\\p{N}]+/gu);
+            if (!words) return null;
+            let matches = null;
+            for (const word of words) {
+                const ids = idsForPrefix(word);
+                matches = matches === null ? ids : new Set([...matches].filter(id => ids.has(id)));
+                if (matches.size === 0) break;
+            }
+            return matches;
+        }
+
+        function searchPublications() {
+            const searchTerm = document.getElementById('publicationSearch').value;
+            const yearFilter = document.getElementById('yearFilter').value;
+            const typeFilter = document.getElementById('typeFilter').value;
+            const sortFilter = document.getElementById('sortFilter').value;
+            
+            filterPublications(searchTerm, yearFilter, typeFilter, sortFilter);
+        }
+        
+        // Years after the first screen are placeholders (data-src) whose
+        // publications are fetched when scrolled into view or filtered on
+        function loadYearSection(section) {
+            if (!section.dataset.src) return Promise.resolve();
+            if (!section.loading) {
+                section.loading = fetch(section.dataset.src)
+                    .then(response => {
+                        if (!response.ok) throw new Error(`${response.status} ${section.dataset.src}`);
+                        return response.text();
+                    })
+                    .then(html => {
+                        section.querySelector('.publications-year').innerHTML = html;
+                        delete section.dataset.src;
+                    })
+                    .catch(error => {
+                        // Leave the placeholder link in place and allow a retry
+                        section.loading = null;
+                        console.error('Could not load publications:', error);
+                    });
+            }
+            return section.loading;
+        }
+        
+        // Placeholder sections that may hold publications the filters show
+        function sectionsToLoad(matches, yearFilter, typeFilter) {
+            const pending = document.querySelectorAll('.year-section[data-src]');
+            return Array.from(pending).filter(section => {
+                if (yearFilter && section.dataset.year !== yearFilter) return false;
+                if (matches) {
+                    const firstId = Number(section.dataset.firstId);
+                    const endId = firstId + Number(section.dataset.count);
+                    return Array.from(matches).some(id => id >= firstId && id < endId);
+                }
+                return Boolean(yearFilter || typeFilter);
+            });
+        }
+        
+        let filterRun = 0;
+        
+        function filterPublications(searchTerm = '', yearFilter = '', typeFilter = '', sortFilter = 'year-desc') {
+            const matches = searchTerm ? matchingPublicationIds(searchTerm) : null;
+            const run = ++filterRun;
+            Promise.all(sectionsToLoad(matches, yearFilter, typeFilter).map(loadYearSection)).then(() => {
+                // A newer search may have started while shards were loading
+                if (run === filterRun) applyFilters(matches, yearFilter, typeFilter);
+            });
+        }
+        
+        function applyFilters(matches, yearFilter, typeFilter) {
+            const yearSections = document.querySelectorAll('.year-section');
+            const noResults = document.getElementById('noResults');
+            const filtering = Boolean(matches || yearFilter || typeFilter);
+            let visibleCount = 0;
+            
+            yearSections.forEach(section => {
+                // Unloaded years hold nothing the current filters match
+                if (section.dataset.src) {
+                    section.style.display = filtering ? 'none' : 'block';
+                    if (!filtering) visibleCount += Number(section.dataset.count);
+                    return;
+                }
+                
+                const year = section.dataset.year;
+                const publications = section.querySelectorAll('.publication-item');
+                let sectionVisible = false;
+                
+                publications.forEach(pub => {
+                    const pubYear = pub.dataset.year;
+                    const pubType = pub.dataset.type;
+
+                    let visible = true;
+
+                    // Apply filters
+                    if (matches && !matches.has(Number(pub.dataset.id))) visible = false;
+                    if (yearFilter && pubYear !== yearFilter) visible = false;
+                    if (typeFilter && pubType !== typeFilter) visible = false;
+                    
+                    if (visible) {
+                        pub.style.display = 'block';
+                        sectionVisible = true;
+                        visibleCount++;
+                    } else {
+                        pub.style.display = 'none';
+                    }
+                });
+                
+                // Show/hide year section based on whether it has visible publications
+                section.style.display = sectionVisible ? 'block' : 'none';
+            });
+            
+            // Update results count
+            document.getElementById('resultsCount').textContent = 
+                `Showing ${visibleCount} publication${visibleCount !== 1 ? 's' : ''}`;
+            
+            // Show/hide no results message
+            noResults.style.display = visibleCount === 0 ? 'block' : 'none';
+        }
+        
+        function clearFilters() {
+            document.getElementById('publicationSearch').value = '';
+            document.getElementById('yearFilter').value = '';
+            document.getElementById('typeFilter').value = '';
+            document.getElementById('sortFilter').value = 'year-desc';
+            filterPublications();
+        }
+        
+        // Add event listeners
+        document.addEventListener('DOMContentLoaded', function() {
+            const searchInput = document.getElementById('publicationSearch');
+            const yearFilter = document.getElementById('yearFilter');
+            const typeFilter = document.getElementById('typeFilter');
+            const sortFilter = document.getElementById('sortFilter');
+            
+            // Fetch deferred years shortly before they scroll into view
+            const placeholders = document.querySelectorAll('.year-section[data-src]');
+            placeholders.forEach(section => {
+                section.querySelector('.year-placeholder').addEventListener('click', function(e) {
+                    e.preventDefault();
+                    loadYearSection(section);
+                });
+            });
+            if ('IntersectionObserver' in window) {
+                const observer = new IntersectionObserver(entries => {
+                    entries.forEach(entry => {
+                        if (entry.isIntersecting) {
+                            observer.unobserve(entry.target);
+                            loadYearSection(entry.target);
+                        }
+                    });
+                }, { rootMargin: '600px 0px' });
+                placeholders.forEach(section => observer.observe(section));
+            } else {
+                placeholders.forEach(loadYearSection);
+            }
+            
+            searchInput.addEventListener('input', searchPublications);
+            yearFilter.addEventListener('change', searchPublications);
+            typeFilter.addEventListener('change', searchPublications);
+            sortFilter.addEventListener('change', searchPublications);
+            
+            // Enter key support for search
+            searchInput.addEventListener('keypress', function(e) {
+                if (e.key === 'Enter') {
+                    searchPublications();
+                }
+            });
+        });
+    </script>'''
+
+def generate_html(write=None, sharded=False, entries=UNCACHED):
+    """Generate the complete HTML for publications page
+
+    Fragments are handed to write (file.write, a socket file's write,
+    list.append, ...) as they are produced, so the page is never built up
+    in memory. Without a sink the page is returned as a string.
+    With sharded=True, years past the first screen are left as placeholders
+    for the fragments written by write_year_shards. entries does the
+    per-publication work (e.g. through the entry cache).
+    """
+    if write is None:
+        fragments = []
+        generate_html(fragments.append, sharded, entries)
+        return ''.join(fragments)
     
     # Load the publications data
-    with open('/Users/mertcagatay/Web Development Projects/SelimCagatayWebpage/publications_data.json', 'r', encoding='utf-8') as f:
+    with open(PUBLICATIONS_JSON_PATH, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
-    html = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="description" content="Dr. Selim Çağatay - Publications and Research Papers">
-    <meta name="keywords" content="publications, research papers, academic articles, journals">
-    <meta name="author" content="Dr. Selim Çağatay">
-    
-    <!-- Cache-busting headers for development -->
-    <meta http-equiv="Cache-Control" content="no-cache, no-store, must-revalidate">
-    <meta http-equiv="Pragma" content="no-cache">
-    <meta http-equiv="Expires" content="0">
-    <title>Publications - Dr. Selim Çağatay</title>
-    
-    <!-- Google Fonts -->
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    
-    <!-- CSS -->
-    <link rel="stylesheet" href="css/style.css?v=2.0.0">
-    
-    <!-- Favicon placeholder -->
-    <link rel="icon" type="image/x-icon" href="images/favicon.ico">
-    
-    <!-- PWA Manifest -->
-    <link rel="manifest" href="manifest.json">
-</head>
-<body>
-    <!-- Header Navigation -->
-    <header class="header">
-        <nav class="nav">
-            <div class="nav-container">
-                <div class="nav-brand">
-                    <h1>Prof. Dr. Selim Çağatay</h1>
-                </div>
-                
-                <!-- Mobile Menu Toggle -->
-                <div class="nav-toggle" id="navToggle">
-                    <span></span>
-                    <span></span>
-                    <span></span>
-                </div>
-                
-                <!-- Navigation Menu -->
-                <ul class="nav-menu" id="navMenu">
-                    <li class="nav-item">
-                        <a href="index.html" class="nav-link">Home</a>
-                    </li>
-                    <li class="nav-item">
-                        <a href="cv.html" class="nav-link">CV</a>
-                    </li>
-                    <li class="nav-item">
-                        <a href="publications.html" class="nav-link active">Publications</a>
-                    </li>
-                    <li class="nav-item">
-                        <a href="research-grants.html" class="nav-link">Research Grants</a>
-                    </li>
-                    <li class="nav-item">
-                        <a href="gallery.html" class="nav-link">Gallery</a>
-                    </li>
-                    <li class="nav-item">
-                        <button class="theme-toggle" id="themeToggle" aria-label="Toggle theme">
-                            <span class="theme-icon" id="themeIcon">🌙</span>
-                        </button>
-                    </li>
-                </ul>
-            </div>
-        </nav>
-    </header>
+    render_page(
+        write,
+        title='Publications - Dr. Selim Çağatay',
+        description='Dr. Selim Çağatay - Publications and Research Papers',
+        keywords='publications, research papers, academic articles, journals',
+        active='publications',
+        main=lambda write: write_main(write, data, sharded, entries),
+        scripts=lambda write: write_scripts(write, data, entries),
+    )
+
+def write_scripts(write, data, entries=UNCACHED):
+    """Write the search index followed by the search script"""
+    write_search_index(write, data, entries)
+    write(SEARCH_SCRIPT)
+
+def year_sections(data, sharded):
+    """(year, id of its first publication, publications, inline) in page order
+
+    Without sharding every year is inline. With it, years are inline until
+    the first screen holds INLINE_PUBLICATIONS publications.
+    """
+    first_id = 0
+    for year, year_pubs in listed_years(data):
+        yield year, first_id, year_pubs, not sharded or first_id < INLINE_PUBLICATIONS
+        first_id += len(year_pubs)
+
+def shard_url(year):
+    return f"{SHARD_URL}/{year}.html"
+
+def write_year_publications(write, year, first_id, year_pubs, entries=UNCACHED):
+    """Write the articles of one year (ids numbered as in build_search_index)"""
+    for pub_id, pub in enumerate(year_pubs, first_id):
+        category_icon = get_category_icon(pub['category'])
+        category_name = get_category_display_name(pub['category'])
+        formatted_text = entries.format_text(pub['text'], pub['category'])
+
+        write(f'''
+                                <article class="publication-item" data-id="{pub_id}" data-year="{year}" data-type="{pub['category']}">
+                                    <div class="publication-header">
+                                        <div class="publication-meta">
+                                            <span class="publication-type">{category_icon} {category_name}</span>
+                                        </div>
+                                    </div>
+                                    <div class="publication-content">
+                                        <p class="publication-text">{formatted_text}</p>
+                                    </div>
+                                </article>''')
+
+def write_year_placeholder(write, year, first_id, count):
+    """Write an empty year section that loads its shard on demand"""
+    url = shard_url(year)
+    write(f'''
+                        <!-- {year} Publications (loaded from {url}) -->
+                        <div class="year-section" data-year="{year}" data-src="{url}" data-first-id="{first_id}" data-count="{count}">
+                            <h3 class="year-title">{year}</h3>
+                            <div class="publications-year">
+                                <a class="year-placeholder" href="{url}">Show {count} publication{'s' if count != 1 else ''} from {year}</a>
+                            </div>
+                        </div>''')
+
+def write_year_shards(data, shard_dir, entries=UNCACHED):
+    """Write one fragment per deferred year and remove stale ones
+
+    Returns the paths of the fragments.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    paths = []
+    for year, first_id, year_pubs, inline in year_sections(data, sharded=True):
+        if inline:
+            continue
+        fragments = []
+        write_year_publications(fragments.append, year, first_id, year_pubs, entries)
+        path = os.path.join(shard_dir, f"{year}.html")
+        write_if_changed(path, ''.join(fragments) + '\n')
+        paths.append(path)
+    for path in existing_shards(shard_dir):
+        if path not in paths:
+            os.remove(path)
+    return paths
 
-    <!-- Main Content -->
-    <main class="main">
+def existing_shards(shard_dir):
+    return sorted(glob.glob(os.path.join(shard_dir, '*.html')))
+
+def write_main(write, data, sharded=False, entries=UNCACHED):
+    """Write the page's main content"""
+    write('''
         <!-- Page Header -->
         <section class="page-header">
             <div class="container">
@@ -162,13 +448,13 @@ def generate_html():
                         <div class="filter-group">
                             <label for="yearFilter">Year:</label>
                             <select id="yearFilter" class="filter-select" aria-label="Filter by year">
-                                <option value="">All Years</option>'''
+                                <option value="">All Years</option>''')
     
     # Add year options
     for year in data['years']:
-        html += f'\n                                <option value="{year}">{year}</option>'
+        write(f'\n                                <option value="{year}">{year}</option>')
     
-    html += '''
+    write('''
                             </select>
                         </div>
                         
@@ -237,42 +523,25 @@ def generate_html():
                         </div>
                     </div>
                     
-                    <div class="publications-container" id="publicationsContainer">'''
+                    <div class="publications-container" id="publicationsContainer">''')
     
-    # Generate publications by year
-    for year in data['years']:
-        if str(year) in data['publications'] and data['publications'][str(year)]:
-            html += f'''
+    # Generate publications by year; with sharding only the first screen is inline
+    for year, first_id, year_pubs, inline in year_sections(data, sharded):
+        if not inline:
+            write_year_placeholder(write, year, first_id, len(year_pubs))
+            continue
+
+        write(f'''
                         <!-- {year} Publications -->
                         <div class="year-section" data-year="{year}">
                             <h3 class="year-title">{year}</h3>
-                            <div class="publications-year">'''
-            
-            # Get publications for this year
-            year_pubs = data['publications'][str(year)]
-            
-            for pub in year_pubs:
-                category_icon = get_category_icon(pub['category'])
-                category_name = get_category_display_name(pub['category'])
-                formatted_text = format_publication_text(pub['text'], pub['category'])
-                
-                html += f'''
-                                <article class="publication-item" data-year="{year}" data-type="{pub['category']}">
-                                    <div class="publication-header">
-                                        <div class="publication-meta">
-                                            <span class="publication-type">{category_icon} {category_name}</span>
-                                        </div>
-                                    </div>
-                                    <div class="publication-content">
-                                        <p class="publication-text">{formatted_text}</p>
-                                    </div>
-                                </article>'''
-            
-            html += '''
+                            <div class="publications-year">''')
+        write_year_publications(write, year, first_id, year_pubs, entries)
+        write('''
                             </div>
-                        </div>'''
+                        </div>''')
     
-    html += '''
+    write('''
                     </div>
                     
                     <!-- No Results Message -->
@@ -319,155 +588,52 @@ def generate_html():
                     </a>
                 </div>
             </div>
-        </section>
-    </main>
-
-    <!-- Footer -->
-    <footer class="footer">
-        <div class="container">
-            <div class="footer-content">
-                <div class="footer-section">
-                    <h3>Office Address</h3>
-                    <p>Akdeniz University<br>
-                    Faculty of Economics and Administrative Sciences<br>
-                    Department of Economics<br>
-                    Dumlupınar cad. 07058-Antalya, Turkey</p>
-                </div>
-                <div class="footer-section">
-                    <h3>Quick Links</h3>
-                    <ul>
-                        <li><a href="index.html">Home</a></li>
-                        <li><a href="cv.html">CV</a></li>
-                        <li><a href="publications.html">Publications</a></li>
-                        <li><a href="research-grants.html">Research Grants</a></li>
-                        <li><a href="gallery.html">Gallery</a></li>
-                    </ul>
-                </div>
-                <div class="footer-section">
-                    <h3>Academic Profiles</h3>
-                    <ul>
-                        <li><a href="#" target="_blank">Google Scholar</a></li>
-                        <li><a href="#" target="_blank">ResearchGate</a></li>
-                        <li><a href="https://orcid.org/0000-0002-5471-3474" target="_blank">ORCID</a></li>
-                        <li><a href="https://www.linkedin.com/in/selim-%C3%A7a%C4%9Fatay-b34889170/" target="_blank">LinkedIn</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; 2025 Prof. Dr. Selim Çağatay. All rights reserved.</p>
-            </div>
-        </div>
-    </footer>
+        </section>''')
 
-    <!-- JavaScript -->
-    <script src="js/script.js"></script>
-    <script>
-        // Enhanced search and filter functionality for publications
-        function searchPublications() {
-            const searchTerm = document.getElementById('publicationSearch').value.toLowerCase();
-            const yearFilter = document.getElementById('yearFilter').value;
-            const typeFilter = document.getElementById('typeFilter').value;
-            const sortFilter = document.getElementById('sortFilter').value;
-            
-            filterPublications(searchTerm, yearFilter, typeFilter, sortFilter);
-        }
-        
-        function filterPublications(searchTerm = '', yearFilter = '', typeFilter = '', sortFilter = 'year-desc') {
-            const yearSections = document.querySelectorAll('.year-section');
-            const noResults = document.getElementById('noResults');
-            let visibleCount = 0;
-            
-            yearSections.forEach(section => {
-                const year = section.dataset.year;
-                const publications = section.querySelectorAll('.publication-item');
-                let sectionVisible = false;
-                
-                publications.forEach(pub => {
-                    const pubYear = pub.dataset.year;
-                    const pubType = pub.dataset.type;
-                    const pubText = pub.textContent.toLowerCase();
-                    
-                    let visible = true;
-                    
-                    // Apply filters
-                    if (searchTerm && !pubText.includes(searchTerm)) visible = false;
-                    if (yearFilter && pubYear !== yearFilter) visible = false;
-                    if (typeFilter && pubType !== typeFilter) visible = false;
-                    
-                    if (visible) {
-                        pub.style.display = 'block';
-                        sectionVisible = true;
-                        visibleCount++;
-                    } else {
-                        pub.style.display = 'none';
-                    }
-                });
-                
-                // Show/hide year section based on whether it has visible publications
-                section.style.display = sectionVisible ? 'block' : 'none';
-            });
-            
-            // Update results count
-            document.getElementById('resultsCount').textContent = 
-                `Showing ${visibleCount} publication${visibleCount !== 1 ? 's' : ''}`;
-            
-            // Show/hide no results message
-            noResults.style.display = visibleCount === 0 ? 'block' : 'none';
-        }
-        
-        function clearFilters() {
-            document.getElementById('publicationSearch').value = '';
-            document.getElementById('yearFilter').value = '';
-            document.getElementById('typeFilter').value = '';
-            document.getElementById('sortFilter').value = 'year-desc';
-            filterPublications();
-        }
-        
-        // Add event listeners
-        document.addEventListener('DOMContentLoaded', function() {
-            const searchInput = document.getElementById('publicationSearch');
-            const yearFilter = document.getElementById('yearFilter');
-            const typeFilter = document.getElementById('typeFilter');
-            const sortFilter = document.getElementById('sortFilter');
-            
-            searchInput.addEventListener('input', searchPublications);
-            yearFilter.addEventListener('change', searchPublications);
-            typeFilter.addEventListener('change', searchPublications);
-            sortFilter.addEventListener('change', searchPublications);
-            
-            // Enter key support for search
-            searchInput.addEventListener('keypress', function(e) {
-                if (e.key === 'Enter') {
-                    searchPublications();
-                }
-            });
-        });
-    </script>
-</body>
-</html>'''
-    
-    return html
+def stage_inputs():
+    """Files this stage reads"""
+    return [PUBLICATIONS_JSON_PATH, __file__, entry_formatter.__file__, matching.__file__] + template_files()
+
+def main(force=False, sharded=True):
+    """Generate and save the publications HTML (and its year shards)"""
+    inputs = stage_inputs()
+    outputs = [PUBLICATIONS_HTML_PATH] + existing_shards(PUBLICATIONS_SHARD_DIR)
+    # Switching between the sharded and the single-page layout rebuilds
+    settings = {'sharded': sharded}
+    if not force and is_stage_current('generate_publications_html', inputs, outputs, settings):
+        print("publications_data.json unchanged - skipping publications.html")
+        return False
 
-def main():
-    """Generate and save the publications HTML"""
     print("Generating publications.html...")
     
-    html_content = generate_html()
-    
-    # Save the HTML file
-    output_path = "/Users/mertcagatay/Web Development Projects/SelimCagatayWebpage/publications.html"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    # Stream the page to disk (left untouched if the bytes are identical),
+    # reusing the rendered text and search words of unchanged entries
+    output_path = PUBLICATIONS_HTML_PATH
+    with EntryCache('generate_publications_html', [__file__, entry_formatter.__file__, matching.__file__]) as cache:
+        entries = EntryRenderer(cache)
+        with open_if_changed(output_path) as f:
+            generate_html(f.write, sharded, entries)
+        if sharded:
+            with open(PUBLICATIONS_JSON_PATH, 'r', encoding='utf-8') as f:
+                shards = write_year_shards(json.load(f), PUBLICATIONS_SHARD_DIR, entries)
+            print(f"{len(shards)} years deferred to: {PUBLICATIONS_SHARD_DIR}")
+        else:
+            shards = write_year_shards({'years': [], 'publications': {}}, PUBLICATIONS_SHARD_DIR)
+    print(f"Entry cache: {cache.summary()}")
+    record_stage('generate_publications_html', inputs, [PUBLICATIONS_HTML_PATH] + shards, settings)
     
     print(f"Publications page generated: {output_path}")
     print("Features included:")
     print("- Real publication data from publications.txt")
-    print("- Search functionality")
+    print("- Indexed search (Turkish-aware, accent-insensitive)")
     print("- Year and type filtering")
+    if sharded:
+        print("- Older years loaded on demand")
     print("- Publication statistics")
     print("- Research Grants navigation link")
     print("- Responsive design")
     print("- Academic styling")
+    return True
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(force='--force' in sys.argv[1:], sharded='--single-page' not in sys.argv[1:])
\ No newline at end of file
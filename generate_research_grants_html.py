@@ -5,25 +5,22 @@ Generate research-grants.html with real data from parsed publications.txt
 """
 
 import json
+import os
 import re
+import sys
 from html import escape
 
+import entry_formatter
+from build_manifest import is_stage_current, open_if_changed, record_stage
+from site_templates import render_page, template_files
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GRANTS_JSON_PATH = os.path.join(BASE_DIR, 'research_grants_data.json')
+GRANTS_HTML_PATH = os.path.join(BASE_DIR, 'research-grants.html')
+
 def format_grant_text(text):
     """Format grant text for HTML display"""
-    text = escape(text)
-    
-    # Highlight author name
-    text = re.sub(r'\b(Selim Çağatay|S\. Çağatay|Çağatay, S\.?|Cagatay, S\.?)\b', 
-                  r'<strong>\1</strong>', text)
-    
-    # Format project titles in quotes
-    text = re.sub(r'"([^"]+)"', r'<em>"\1"</em>', text)
-    
-    # Format organization names
-    text = re.sub(r'\b(TÜBİTAK|BAKA|ICMPD|AFAD|EU|Akdeniz|OSB|ATSO|EBRD|FEMISE|OECD|UNDP|World Bank|FAO)\b', 
-                  r'<strong>\1</strong>', text)
-    
-    return text
+    return entry_formatter.format_entry(text, 'grant')
 
 def extract_grant_info(grant_text):
     """Extract grant information from text"""
@@ -68,85 +65,34 @@ def extract_grant_info(grant_text):
         'date': date
     }
 
-def generate_html():
-    """Generate the complete HTML for research grants page"""
+def generate_html(write=None):
+    """Generate the complete HTML for research grants page
+
+    Fragments are handed to write (file.write, a socket file's write,
+    list.append, ...) as they are produced, so the page is never built up
+    in memory. Without a sink the page is returned as a string.
+    """
+    if write is None:
+        fragments = []
+        generate_html(fragments.append)
+        return ''.join(fragments)
     
     # Load the research grants data
-    with open('/Users/mertcagatay/Web Development Projects/SelimCagatayWebpage/research_grants_data.json', 'r', encoding='utf-8') as f:
+    with open(GRANTS_JSON_PATH, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
-    html = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="description" content="Dr. Selim Çağatay - Research Grants and Funded Projects">
-    <meta name="keywords" content="research grants, funded projects, TÜBİTAK, academic funding">
-    <meta name="author" content="Dr. Selim Çağatay">
-    
-    <!-- Cache-busting headers for development -->
-    <meta http-equiv="Cache-Control" content="no-cache, no-store, must-revalidate">
-    <meta http-equiv="Pragma" content="no-cache">
-    <meta http-equiv="Expires" content="0">
-    <title>Research Grants - Dr. Selim Çağatay</title>
-    
-    <!-- Google Fonts -->
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    
-    <!-- CSS -->
-    <link rel="stylesheet" href="css/style.css?v=2.0.0">
-    
-    <!-- Favicon placeholder -->
-    <link rel="icon" type="image/x-icon" href="images/favicon.ico">
-    
-    <!-- PWA Manifest -->
-    <link rel="manifest" href="manifest.json">
-</head>
-<body>
-    <!-- Header Navigation -->
-    <header class="header">
-        <nav class="nav">
-            <div class="nav-container">
-                <div class="nav-brand">
-                    <h1>Prof. Dr. Selim Çağatay</h1>
-                </div>
-                
-                <!-- Mobile Menu Toggle -->
-                <div class="nav-toggle" id="navToggle">
-                    <span></span>
-                    <span></span>
-                    <span></span>
-                </div>
-                
-                <!-- Navigation Menu -->
-                <ul class="nav-menu" id="navMenu">
-                    <li class="nav-item">
-                        <a href="index.html" class="nav-link">Home</a>
-                    </li>
-                    <li class="nav-item">
-                        <a href="cv.html" class="nav-link">CV</a>
-                    </li>
-                    <li class="nav-item">
-                        <a href="publications.html" class="nav-link">Publications</a>
-                    </li>
-                    <li class="nav-item">
-                        <a href="research-grants.html" class="nav-link active">Research Grants</a>
-                    </li>
-                    <li class="nav-item">
-                        <a href="gallery.html" class="nav-link">Gallery</a>
-                    </li>
-                    <li class="nav-item">
-                        <button class="theme-toggle" id="themeToggle" aria-label="Toggle theme">
-                            <span class="theme-icon" id="themeIcon">🌙</span>
-                        </button>
-                    </li>
-                </ul>
-            </div>
-        </nav>
-    </header>
+    render_page(
+        write,
+        title='Research Grants - Dr. Selim Çağatay',
+        description='Dr. Selim Çağatay - Research Grants and Funded Projects',
+        keywords='research grants, funded projects, TÜBİTAK, academic funding',
+        active='research_grants',
+        main=lambda write: write_main(write, data),
+    )
 
-    <!-- Main Content -->
-    <main class="main">
+def write_main(write, data):
+    """Write the page's main content"""
+    write('''
         <!-- Page Header -->
         <section class="page-header">
             <div class="container">
@@ -182,7 +128,7 @@ def generate_html():
         <!-- Research Grants Content -->
         <section class="research-grants-content">
             <div class="container">
-                <div class="grants-container">'''
+                <div class="grants-container">''')
     
     # Generate grants list
     for i, grant in enumerate(data['grants']):
@@ -197,25 +143,25 @@ def generate_html():
         if len(lines) > 1 and '(' in lines[1]:
             translation = lines[1].strip()
         
-        html += f'''
+        write(f'''
                     
                     <!-- Grant {i+1} -->
                     <div class="grant-item">
                         <div class="grant-header">
-                            <h3 class="grant-title">{escape(title)}</h3>'''
+                            <h3 class="grant-title">{escape(title)}</h3>''')
         
         if grant_info['project_number']:
-            html += f'''
-                            <span class="grant-number">{escape(grant_info['project_number'])}</span>'''
+            write(f'''
+                            <span class="grant-number">{escape(grant_info['project_number'])}</span>''')
         
-        html += f'''
-                        </div>'''
+        write(f'''
+                        </div>''')
         
         if translation:
-            html += f'''
-                        <p class="grant-translation">{escape(translation)}</p>'''
+            write(f'''
+                        <p class="grant-translation">{escape(translation)}</p>''')
         
-        html += f'''
+        write(f'''
                         <div class="grant-meta">
                             <span class="grant-role">{escape(grant_info['role'])}</span>
                             <span class="grant-date">{escape(grant_info['date'])}</span>
@@ -223,9 +169,9 @@ def generate_html():
                         <div class="grant-description">
                             <p>{formatted_text}</p>
                         </div>
-                    </div>'''
+                    </div>''')
     
-    html += '''
+    write('''
                 </div>
             </div>
         </section>
@@ -257,62 +203,27 @@ def generate_html():
                     </div>
                 </div>
             </div>
-        </section>
-    </main>
-
-    <!-- Footer -->
-    <footer class="footer">
-        <div class="container">
-            <div class="footer-content">
-                <div class="footer-section">
-                    <h3>Office Address</h3>
-                    <p>Akdeniz University<br>
-                    Faculty of Economics and Administrative Sciences<br>
-                    Department of Economics<br>
-                    Dumlupınar cad. 07058-Antalya, Turkey</p>
-                </div>
-                <div class="footer-section">
-                    <h3>Quick Links</h3>
-                    <ul>
-                        <li><a href="index.html">Home</a></li>
-                        <li><a href="cv.html">CV</a></li>
-                        <li><a href="publications.html">Publications</a></li>
-                        <li><a href="gallery.html">Gallery</a></li>
-                    </ul>
-                </div>
-                <div class="footer-section">
-                    <h3>Academic Profiles</h3>
-                    <ul>
-                        <li><a href="#" target="_blank">Google Scholar</a></li>
-                        <li><a href="#" target="_blank">ResearchGate</a></li>
-                        <li><a href="https://orcid.org/0000-0002-5471-3474" target="_blank">ORCID</a></li>
-                        <li><a href="https://www.linkedin.com/in/selim-%C3%A7a%C4%9Fatay-b34889170/" target="_blank">LinkedIn</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; 2025 Prof. Dr. Selim Çağatay. All rights reserved.</p>
-            </div>
-        </div>
-    </footer>
+        </section>''')
 
-    <!-- JavaScript -->
-    <script src="js/script.js"></script>
-</body>
-</html>'''
-    
-    return html
+def stage_inputs():
+    """Files this stage reads"""
+    return [GRANTS_JSON_PATH, __file__, entry_formatter.__file__] + template_files()
 
-def main():
+def main(force=False):
     """Generate and save the research grants HTML"""
+    inputs = stage_inputs()
+    outputs = [GRANTS_HTML_PATH]
+    if not force and is_stage_current('generate_research_grants_html', inputs, outputs):
+        print("research_grants_data.json unchanged - skipping research-grants.html")
+        return False
+
     print("Generating research-grants.html...")
     
-    html_content = generate_html()
-    
-    # Save the HTML file
-    output_path = "/Users/mertcagatay/Web Development Projects/SelimCagatayWebpage/research-grants.html"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    # Stream the page to disk (left untouched if the bytes are identical)
+    output_path = GRANTS_HTML_PATH
+    with open_if_changed(output_path) as f:
+        generate_html(f.write)
+    record_stage('generate_research_grants_html', inputs, outputs)
     
     print(f"Research grants page generated: {output_path}")
     print("Features included:")
@@ -322,6 +233,7 @@ def main():
     print("- Funding agency highlighting")
     print("- Responsive design")
     print("- Academic styling")
+    return True
 
 if __name__ == "__main__":
-    main()
+    main(force='--force' in sys.argv[1:])
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generate sw.js from the built site
+The service worker precaches the pages, the fingerprinted stylesheet and
+script and a few key files, each with a revision hash of its contents: on
+update only files whose revision changed are downloaded again, and entries
+of files no longer listed are dropped. Pages and publication fragments are
+fetched network-first, so edits and live reload show up at once, and come
+from the precache only offline; the other precached files are served
+cache-first. Gallery images go to a separate runtime cache, served
+stale-while-revalidate and capped at GALLERY_CACHE_ENTRIES with the least
+recently used images evicted first.
+Usage: python generate_service_worker.py [--force]
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sys
+
+from build_manifest import is_stage_current, record_stage, write_if_changed
+from fingerprint_assets import ASSET_MANIFEST_PATH
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVICE_WORKER_PATH = os.path.join(BASE_DIR, 'sw.js')
+
+# Precached besides the fingerprinted assets, relative to BASE_DIR
+PRECACHE_PATTERNS = ['*.html', 'publications/*.html', 'manifest.json',
+                     'images/profile-photo.jpg', 'assets/cv.pdf']
+
+# The site root is served as index.html
+INDEX_PAGE = 'index.html'
+
+# URL prefixes of precached fragments fetched network-first like pages
+FRAGMENT_PREFIXES = ['/publications/']
+
+# URL prefixes cached at runtime as gallery images
+GALLERY_PREFIXES = ['/images/gallery/', '/images/derivatives/']
+GALLERY_CACHE_ENTRIES = 120
+
+REVISION_LENGTH = 10
+
+SERVICE_WORKER_SCRIPT = '''// Service Worker for Academic Website
+// Generated by generate_service_worker.py - do not edit by hand
+
+const PRECACHE_NAME = 'precache';
+const GALLERY_CACHE_NAME = 'gallery-images';
+const FRAGMENT_PREFIXES = __FRAGMENT_PREFIXES__;
+const GALLERY_PREFIXES = __GALLERY_PREFIXES__;
+const GALLERY_CACHE_ENTRIES = __GALLERY_CACHE_ENTRIES__;
+
+// URL and content revision of every precached file
+const PRECACHE_MANIFEST = __PRECACHE_MANIFEST__;
+
+// Precached responses are stored under their URL plus revision, so a file
+// is downloaded again only when its revision changes
+const precacheKeys = new Map(PRECACHE_MANIFEST.map(entry => [
+    new URL(entry.url, self.location).href,
+    new URL(`${entry.url}?__revision=${entry.revision}`, self.location).href
+]));
+
+// Install event - fetch precached files that are new or have changed
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(PRECACHE_NAME).then(cache =>
+            Promise.all(Array.from(precacheKeys, async ([url, key]) => {
+                if (await cache.match(key)) {
+                    return;
+                }
+                const response = await fetch(url, { cache: 'no-cache' });
+                if (!response.ok) {
+                    throw new Error(`Precaching ${url} failed: ${response.status}`);
+                }
+                await cache.put(key, response);
+            }))
+        ).then(() => self.skipWaiting())
+    );
+});
+
+// Activate event - drop outdated revisions and caches of older versions
+self.addEventListener('activate', event => {
+    const currentKeys = new Set(precacheKeys.values());
+    event.waitUntil((async () => {
+        for (const cacheName of await caches.keys()) {
+            if (cacheName !== PRECACHE_NAME && cacheName !== GALLERY_CACHE_NAME) {
+                console.log('Deleting old cache:', cacheName);
+                await caches.delete(cacheName);
+            }
+        }
+        const cache = await caches.open(PRECACHE_NAME);
+        for (const request of await cache.keys()) {
+            if (!currentKeys.has(request.url)) {
+                await cache.delete(request);
+            }
+        }
+        await self.clients.claim();
+    })());
+});
+
+// Keep the gallery cache bounded; keys are ordered from least to most
+// recently stored, and every use stores the image again
+async function trimGalleryCache(cache) {
+    const keys = await cache.keys();
+    for (let i = 0; i < keys.length - GALLERY_CACHE_ENTRIES; i++) {
+        await cache.delete(keys[i]);
+    }
+}
+
+// Stale-while-revalidate: answer from the cache at once when possible and
+// refresh the cached image from the network in the background
+async function galleryImage(event) {
+    const cache = await caches.open(GALLERY_CACHE_NAME);
+    const cached = await cache.match(event.request);
+    const refresh = fetch(event.request).then(async response => {
+        if (response.ok) {
+            await cache.put(event.request, response.clone());
+        }
+        return response;
+    }).catch(async error => {
+        if (!cached) {
+            throw error;
+        }
+        // Offline: store the cached copy again to mark it as recently used
+        await cache.delete(event.request);
+        await cache.put(event.request, cached.clone());
+        return cached;
+    }).then(async response => {
+        await trimGalleryCache(cache);
+        return response;
+    });
+    event.waitUntil(refresh.catch(() => {}));
+    return cached ? cached.clone() : refresh;
+}
+
+// Network-first: the current page when online, the precached one offline
+async function precachedPage(event, precacheKey) {
+    try {
+        return await fetch(event.request);
+    } catch (error) {
+        const cached = await caches.open(PRECACHE_NAME).then(cache => cache.match(precacheKey));
+        if (!cached) {
+            throw error;
+        }
+        return cached;
+    }
+}
+
+// Fetch event - pages and fragments come from the network with the
+// precache as fallback, other precached files from the cache, gallery
+// images from the runtime cache, everything else from the network with a
+// cached fallback
+self.addEventListener('fetch', event => {
+    if (event.request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(event.request.url);
+    url.hash = '';
+    const precacheKey = url.origin === self.location.origin && !url.search && precacheKeys.get(url.href);
+    if (precacheKey && (event.request.mode === 'navigate' ||
+                        FRAGMENT_PREFIXES.some(prefix => url.pathname.startsWith(prefix)))) {
+        event.respondWith(precachedPage(event, precacheKey));
+    } else if (precacheKey) {
+        event.respondWith(
+            caches.open(PRECACHE_NAME)
+                .then(cache => cache.match(precacheKey))
+                .then(response => response || fetch(event.request))
+        );
+    } else if (url.origin === self.location.origin &&
+               GALLERY_PREFIXES.some(prefix => url.pathname.startsWith(prefix))) {
+        event.respondWith(galleryImage(event));
+    } else {
+        event.respondWith(
+            fetch(event.request).catch(() =>
+                caches.match(event.request).then(response => response || Response.error()))
+        );
+    }
+});
+'''
+
+def load_asset_manifest():
+    try:
+        with open(ASSET_MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def precache_files():
+    """Relative paths of the files to precache"""
+    paths = set(load_asset_manifest().values())
+    for pattern in PRECACHE_PATTERNS:
+        for path in glob.glob(os.path.join(BASE_DIR, pattern)):
+            paths.add(os.path.relpath(path, BASE_DIR).replace(os.sep, '/'))
+    return sorted(paths)
+
+def file_revision(path):
+    with open(os.path.join(BASE_DIR, path), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:REVISION_LENGTH]
+
+def precache_manifest():
+    """URL and revision of every precached file, the site root included"""
+    manifest = []
+    for path in precache_files():
+        revision = file_revision(path)
+        if path == INDEX_PAGE:
+            manifest.append({'url': '/', 'revision': revision})
+        manifest.append({'url': '/' + path, 'revision': revision})
+    return manifest
+
+def render_service_worker(manifest):
+    return (SERVICE_WORKER_SCRIPT
+            .replace('__FRAGMENT_PREFIXES__', json.dumps(FRAGMENT_PREFIXES))
+            .replace('__GALLERY_PREFIXES__', json.dumps(GALLERY_PREFIXES))
+            .replace('__GALLERY_CACHE_ENTRIES__', str(GALLERY_CACHE_ENTRIES))
+            .replace('__PRECACHE_MANIFEST__', '[\n' + ',\n'.join(
+                f'    {json.dumps(entry)}' for entry in manifest) + '\n]'))
+
+def stage_inputs():
+    """Files this stage reads"""
+    inputs = [os.path.join(BASE_DIR, path) for path in precache_files()]
+    return inputs + [ASSET_MANIFEST_PATH, __file__]
+
+def main(force=False):
+    """Generate and save the service worker"""
+    inputs = stage_inputs()
+    outputs = [SERVICE_WORKER_PATH]
+    if not force and is_stage_current('generate_service_worker', inputs, outputs):
+        print("Precached files unchanged - skipping sw.js")
+        return False
+
+    print("Generating sw.js...")
+    manifest = precache_manifest()
+    write_if_changed(SERVICE_WORKER_PATH, render_service_worker(manifest))
+    record_stage('generate_service_worker', inputs, outputs)
+
+    print(f"{len(manifest)} precached URLs, up to {GALLERY_CACHE_ENTRIES} gallery images cached at runtime")
+    print(f"Service worker saved to: {SERVICE_WORKER_PATH}")
+    return True
+
+if __name__ == "__main__":
+    main(force='--force' in sys.argv[1:])
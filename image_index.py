@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index the capture time, size and orientation of the gallery photos
+Reads only the start of each file: the JPEG segments up to the frame
+header (with the EXIF block among them) or the PNG header chunk, seeking
+past everything else and never touching the pixel data. The index is kept
+in .build/image_index.json and refreshed incrementally: a file whose
+mtime and size are unchanged keeps its entry without being opened.
+The gallery page and the image derivatives read their metadata from here.
+Usage: python image_index.py [--force]
+"""
+
+import json
+import os
+import re
+import struct
+import sys
+from datetime import datetime
+
+from build_manifest import MANIFEST_DIR
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GALLERY_DIR = os.path.join(BASE_DIR, 'images', 'gallery')
+INDEX_PATH = os.path.join(MANIFEST_DIR, 'image_index.json')
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+
+# EXIF orientations that turn the stored image by 90 degrees
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+# TIFF tags read from the EXIF block
+TAG_ORIENTATION = 0x0112
+TAG_DATETIME = 0x0132
+TAG_EXIF_IFD = 0x8769
+TAG_DATETIME_ORIGINAL = 0x9003
+TAG_DATETIME_DIGITIZED = 0x9004
+
+# TIFF field types: size of one value in bytes
+TIFF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 7: 1, 9: 4, 10: 8}
+
+# JPEG start-of-frame markers (C4, C8 and CC are other segments)
+SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+APP1_MARKER = 0xE1
+SOS_MARKER = 0xDA
+EOI_MARKER = 0xD9
+# Markers standing alone, without a length
+STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def natural_sort_key(name):
+    """Sort '2.jpg' before '10.jpg'"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+def find_gallery_images(gallery_dir=GALLERY_DIR):
+    """List gallery image file names, matching extensions case-insensitively"""
+    names = [
+        name for name in os.listdir(gallery_dir)
+        if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+        and os.path.isfile(os.path.join(gallery_dir, name))
+    ]
+    return sorted(names, key=natural_sort_key)
+
+def to_url(path):
+    """Site-relative URL for a path under BASE_DIR"""
+    return os.path.relpath(path, BASE_DIR).replace(os.sep, '/')
+
+def read_ifd(tiff, offset, byte_order):
+    """Tag -> (type, count, value bytes) of the TIFF directory at offset"""
+    (count,) = struct.unpack_from(byte_order + 'H', tiff, offset)
+    fields = {}
+    for position in range(offset + 2, offset + 2 + 12 * count, 12):
+        tag, kind, values = struct.unpack_from(byte_order + 'HHI', tiff, position)
+        size = TIFF_TYPE_SIZES.get(kind, 1) * values
+        # Values of up to four bytes are stored in place of the offset
+        if size > 4:
+            (start,) = struct.unpack_from(byte_order + 'I', tiff, position + 8)
+        else:
+            start = position + 8
+        fields[tag] = (kind, values, tiff[start:start + size])
+    return fields
+
+def short_value(field, byte_order):
+    if field is None or field[0] != 3:
+        return None
+    return struct.unpack_from(byte_order + 'H', field[2])[0]
+
+def date_value(field):
+    """ISO capture time of an EXIF date ('2018:03:11 07:23:30'), if it is a valid one"""
+    if field is None or field[0] != 2:
+        return None
+    text = field[2].split(b'\0')[0].decode('ascii', 'replace').strip()
+    try:
+        return datetime.strptime(text, '%Y:%m:%d %H:%M:%S').isoformat()
+    except ValueError:
+        return None
+
+def parse_exif(tiff):
+    """Orientation and capture time from a TIFF-structured EXIF block"""
+    byte_order = {b'II': '<', b'MM': '>'}.get(tiff[:2])
+    if byte_order is None:
+        return {}
+    try:
+        (ifd_offset,) = struct.unpack_from(byte_order + 'I', tiff, 4)
+        ifd0 = read_ifd(tiff, ifd_offset, byte_order)
+        exif = {}
+        if TAG_EXIF_IFD in ifd0:
+            (exif_offset,) = struct.unpack_from(byte_order + 'I', ifd0[TAG_EXIF_IFD][2])
+            exif = read_ifd(tiff, exif_offset, byte_order)
+    except struct.error:
+        return {}
+    # When the photo was taken, else digitized, else last edited
+    captured = (date_value(exif.get(TAG_DATETIME_ORIGINAL))
+                or date_value(exif.get(TAG_DATETIME_DIGITIZED))
+                or date_value(ifd0.get(TAG_DATETIME)))
+    return {'orientation': short_value(ifd0.get(TAG_ORIENTATION), byte_order), 'captured': captured}
+
+def read_jpeg_header(f):
+    """Stored size, orientation and capture time from a JPEG's header segments"""
+    info = {'orientation': None, 'captured': None}
+    while True:
+        byte = f.read(1)
+        if not byte:
+            break
+        if byte != b'\xff':
+            continue
+        marker = f.read(1)
+        # Any number of 0xFF bytes may pad a marker
+        while marker == b'\xff':
+            marker = f.read(1)
+        if not marker:
+            break
+        marker = marker[0]
+        if marker in STANDALONE_MARKERS:
+            continue
+        if marker in (SOS_MARKER, EOI_MARKER):
+            break
+        (length,) = struct.unpack('>H', f.read(2))
+        # The length counts its own two bytes; less would seek backwards forever
+        if length < 2:
+            raise ValueError(f"invalid length {length} of JPEG segment {marker:#04x}")
+        if marker == APP1_MARKER:
+            payload = f.read(length - 2)
+            if payload.startswith(b'Exif\0\0'):
+                info.update(parse_exif(payload[6:]))
+        elif marker in SOF_MARKERS:
+            height, width = struct.unpack('>xHH', f.read(5))
+            info.update(width=width, height=height)
+            # The EXIF block comes before the frame: nothing left to read
+            return info
+        else:
+            f.seek(length - 2, os.SEEK_CUR)
+    raise ValueError("no JPEG frame header found")
+
+def read_png_header(f):
+    """Size from a PNG's header chunk; PNGs carry no EXIF orientation here"""
+    chunk = f.read(16)
+    if chunk[4:8] != b'IHDR':
+        raise ValueError("no PNG header chunk found")
+    width, height = struct.unpack('>II', chunk[8:16])
+    return {'width': width, 'height': height, 'orientation': None, 'captured': None}
+
+def read_header(path):
+    """Index entry for one image, read from its header only"""
+    with open(path, 'rb') as f:
+        signature = f.read(8)
+        try:
+            if signature.startswith(b'\xff\xd8'):
+                f.seek(2)
+                return read_jpeg_header(f)
+            if signature == PNG_SIGNATURE:
+                return read_png_header(f)
+        except (ValueError, struct.error) as e:
+            raise ValueError(f"{path}: {e}") from e
+    raise ValueError(f"{path} is neither a JPEG nor a PNG")
+
+def displayed_size(entry):
+    """(width, height) of an indexed image once its orientation is applied"""
+    if entry['orientation'] in TRANSPOSED_ORIENTATIONS:
+        return entry['height'], entry['width']
+    return entry['width'], entry['height']
+
+def capture_order(images):
+    """URLs of indexed images, newest capture first and undated ones last by name"""
+    urls = sorted(images, key=natural_sort_key)
+    dated = [url for url in urls if images[url]['captured']]
+    # A reversed sort is still stable: photos taken at the same time stay in name order
+    dated.sort(key=lambda url: images[url]['captured'], reverse=True)
+    return dated + [url for url in urls if not images[url]['captured']]
+
+def load_index(path=INDEX_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'images': {}}
+
+def save_index(index, path=INDEX_PATH):
+    """Write the index atomically; stages running in parallel may share it"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def update_index(paths, force=False):
+    """Index entries of the images, keyed by site URL
+
+    Only files whose mtime or size changed are read. Returns the entries
+    and the number of files read.
+    """
+    previous = load_index()['images']
+    images = {}
+    refreshed = 0
+    for path in paths:
+        url = to_url(path)
+        fs = os.stat(path)
+        old = previous.get(url)
+        if not force and old and old['mtime_ns'] == fs.st_mtime_ns and old['size'] == fs.st_size:
+            images[url] = old
+            continue
+        images[url] = dict(read_header(path), mtime_ns=fs.st_mtime_ns, size=fs.st_size)
+        refreshed += 1
+    # Entries of removed files are dropped
+    if images != previous:
+        save_index({'images': {url: images[url] for url in sorted(images, key=natural_sort_key)}})
+    return images, refreshed
+
+def gallery_index(force=False):
+    """Index entries of every gallery photo"""
+    paths = [os.path.join(GALLERY_DIR, name) for name in find_gallery_images()]
+    return update_index(paths, force=force)
+
+def main(force=False):
+    """Bring the gallery index up to date and summarize it"""
+    print("Indexing gallery photo headers...")
+    images, refreshed = gallery_index(force=force)
+    dated = [entry['captured'] for entry in images.values() if entry['captured']]
+    print(f"{len(images)} photos, {refreshed} read from disk, {len(images) - refreshed} unchanged")
+    if dated:
+        print(f"{len(dated)} with a capture time, from {min(dated)[:10]} to {max(dated)[:10]}")
+    print(f"Image index saved to: {INDEX_PATH}")
+
+if __name__ == "__main__":
+    main(force='--force' in sys.argv[1:])
@@ -114,11 +114,12 @@ function initializeGallery() {
 
 function initializeGalleryFilters() {
     const filterButtons = document.querySelectorAll('.filter-btn');
-    const galleryItems = document.querySelectorAll('.gallery-item');
     
     filterButtons.forEach(button => {
         button.addEventListener('click', function() {
             const filter = this.getAttribute('data-filter');
+            // Looked up on each click: later batches add gallery items
+            const galleryItems = document.querySelectorAll('.gallery-item');
             
             // Update active button
             filterButtons.forEach(btn => btn.classList.remove('active'));
@@ -970,8 +971,11 @@ let isCarouselPlaying = false;
 let progressInterval = null;
 
 function initializeCarousel() {
-    // Get all gallery images and randomly select 20
+    // Get all gallery images, including batches not rendered yet, and randomly select 20
     const allImages = Array.from(document.querySelectorAll('.gallery-item img'));
+    document.querySelectorAll('template.gallery-batch').forEach(batch => {
+        allImages.push(...batch.content.querySelectorAll('.gallery-item img'));
+    });
     carouselPhotos = getRandomPhotos(allImages, 20);
     
     if (carouselPhotos.length === 0) return;
@@ -993,7 +997,9 @@ function initializeCarousel() {
 function getRandomPhotos(images, count) {
     const shuffled = [...images].sort(() => 0.5 - Math.random());
     return shuffled.slice(0, Math.min(count, shuffled.length)).map(img => ({
-        src: img.src,
+        src: img.getAttribute('src'),
+        srcset: img.getAttribute('srcset'),
+        full: img.getAttribute('data-full') || img.getAttribute('src'),
         alt: img.alt,
         caption: img.getAttribute('data-caption') || img.alt,
         title: img.closest('.gallery-item').querySelector('.gallery-info h3')?.textContent || img.alt
@@ -1010,7 +1016,7 @@ function buildCarouselSlides() {
         const slide = document.createElement('div');
         slide.className = 'carousel-slide';
         slide.innerHTML = `
-            <img src="${photo.src}" alt="${photo.alt}" loading="lazy" class="carousel-image">
+            <img src="${photo.src}"${photo.srcset ? ` srcset="${photo.srcset}" sizes="90vw"` : ''} alt="${photo.alt}" loading="lazy" class="carousel-image">
             <div class="carousel-slide-info">
                 <h3>${photo.title}</h3>
                 <p>${photo.caption}</p>
@@ -1232,7 +1238,7 @@ function openCarouselModal(index) {
     if (!modal || !modalImage || !carouselPhotos[index]) return;
     
     const photo = carouselPhotos[index];
-    modalImage.src = photo.src;
+    modalImage.src = photo.full;
     modalImage.alt = photo.alt;
     
     // Apply protection to carousel modal image
@@ -1427,51 +1433,7 @@ function addImageProtection() {
     });
 
     // Add protection and click handlers to all gallery images
-    const galleryImages = document.querySelectorAll('.gallery-image');
-    galleryImages.forEach(img => {
-        addImageProtectionToElement(img);
-        
-        // Make every gallery image clickable for lightbox
-        const galleryItem = img.closest('.gallery-item');
-        if (galleryItem) {
-            // Add cursor pointer to indicate clickable
-            img.style.cursor = 'pointer';
-            galleryItem.style.cursor = 'pointer';
-            
-            // Remove existing click handlers to avoid conflicts
-            img.onclick = null;
-            galleryItem.onclick = null;
-            
-            // Add click handler to the image itself
-            img.addEventListener('click', function(e) {
-                e.preventDefault();
-                e.stopPropagation();
-                
-                // Update gallery images array
-                updateGalleryImages();
-                
-                // Find current image index
-                const allGalleryImages = document.querySelectorAll('.gallery-item img');
-                currentImageIndex = Array.from(allGalleryImages).indexOf(img);
-                
-                // Open lightbox
-                displayLightboxImage();
-                const lightbox = document.getElementById('lightbox');
-                if (lightbox) {
-                    lightbox.classList.add('active');
-                    document.body.style.overflow = 'hidden';
-                }
-            });
-            
-            // Also add click handler to the gallery item wrapper for larger click area
-            galleryItem.addEventListener('click', function(e) {
-                // Only trigger if not clicking a button
-                if (!e.target.classList.contains('gallery-btn') && !e.target.classList.contains('btn-icon')) {
-                    img.click();
-                }
-            });
-        }
-    });
+    initializeGalleryImages();
     
     // Add protection to carousel images when they're created
     setTimeout(() => {
@@ -1515,9 +1477,60 @@ function enhanceLightbox() {
     }
 }
 
+// Gallery images that already have their protection and click handlers
+const initializedGalleryImages = new WeakSet();
+
+function initializeGalleryImage(img) {
+    if (initializedGalleryImages.has(img)) return;
+    initializedGalleryImages.add(img);
+    
+    addImageProtectionToElement(img);
+    
+    // Make every gallery image clickable for lightbox
+    const galleryItem = img.closest('.gallery-item');
+    if (galleryItem) {
+        // Add cursor pointer to indicate clickable
+        img.style.cursor = 'pointer';
+        galleryItem.style.cursor = 'pointer';
+        
+        // Remove existing click handlers to avoid conflicts
+        img.onclick = null;
+        galleryItem.onclick = null;
+        
+        // Add click handler to the image itself
+        img.addEventListener('click', function(e) {
+            e.preventDefault();
+            e.stopPropagation();
+            
+            // Update gallery images array
+            updateGalleryImages();
+            
+            // Find current image index
+            const allGalleryImages = document.querySelectorAll('.gallery-item img');
+            currentImageIndex = Array.from(allGalleryImages).indexOf(img);
+            
+            // Open lightbox
+            displayLightboxImage();
+            const lightbox = document.getElementById('lightbox');
+            if (lightbox) {
+                lightbox.classList.add('active');
+                document.body.style.overflow = 'hidden';
+            }
+        });
+        
+        // Also add click handler to the gallery item wrapper for larger click area
+        galleryItem.addEventListener('click', function(e) {
+            // Only trigger if not clicking a button
+            if (!e.target.classList.contains('gallery-btn') && !e.target.classList.contains('btn-icon')) {
+                img.click();
+            }
+        });
+    }
+}
+
 // Function to reinitialize gallery images (call this when new images are loaded)
 function initializeGalleryImages() {
-    addImageProtection();
+    document.querySelectorAll('.gallery-image').forEach(initializeGalleryImage);
 }
 
 // Initialize protection when DOM is loaded
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Matching helpers shared by the publication and photo stages
+Text folding and DOI extraction for comparing and searching publications,
+and the union-find the duplicate finders group their matches with.
+"""
+
+import re
+import unicodedata
+
+# DOIs as written in publications.txt ("DOI: 10.1080/...")
+DOI_PATTERN = re.compile(r'DOI:\s*(10\.\d+/[^\s,]+)')
+
+# Dotted and dotless i both fold to a plain i
+TURKISH_I = str.maketrans({'İ': 'i', 'ı': 'i'})
+
+def fold_text(text):
+    """Case-fold text for search, Turkish-aware and without diacritics
+
+    Must match foldText in the publications page's SEARCH_SCRIPT:
+    'Çağatay', 'CAGATAY' and 'çağatay' all fold to 'cagatay', and
+    'İktisat' to 'iktisat'.
+    """
+    text = unicodedata.normalize('NFKD', text.translate(TURKISH_I).lower())
+    return ''.join(char for char in text if not unicodedata.category(char).startswith('M'))
+
+class DisjointSet:
+    """Union-find over record ids"""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a, b):
+        """Join two sets; returns False if they already were one"""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        self.parent[max(a, b)] = min(a, b)
+        return True
@@ -6,33 +6,51 @@ Extracts and organizes publications by category and year
 Updated to handle new publications.txt format with Research Grants section
 """
 
+import os
 import re
+import sys
 import json
 from datetime import datetime
 from collections import defaultdict
+from functools import lru_cache
 
-def extract_year_from_text(text):
-    """Extract publication year from text using various patterns"""
-    # Look for 4-digit years
-    year_patterns = [
-        r'\b(20\d{2})\b',  # 2000-2099
-        r'\b(19\d{2})\b',  # 1900-1999
-        r'Vol\.?\s*\d+.*?(\d{4})',  # Volume patterns
-        r'cilt\.?\s*\d+.*?(\d{4})',  # Turkish volume patterns
-        r'pp?\.\s*\d+-\d+,?\s*(\d{4})',  # Page patterns
-        r's[sa]?\.\s*\d+-\d+,?\s*(\d{4})',  # Turkish page patterns
-        r'(\d{4})\.',  # Year followed by period
-        r',\s*(\d{4})',  # Year after comma
-    ]
-    
-    for pattern in year_patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            years = [int(year) for year in matches if 1990 <= int(year) <= 2025]
-            if years:
-                return max(years)  # Return most recent year if multiple found
-    
-    return None
+from build_manifest import is_stage_current, record_stage, write_if_changed
+from entry_cache import EntryCache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PUBLICATIONS_TXT_PATH = os.path.join(BASE_DIR, 'publications.txt')
+PUBLICATIONS_JSON_PATH = os.path.join(BASE_DIR, 'publications_data.json')
+GRANTS_JSON_PATH = os.path.join(BASE_DIR, 'research_grants_data.json')
+
+# Default window of plausible publication years; forthcoming work may
+# carry next year's date
+MIN_YEAR = 1990
+MAX_YEAR = datetime.now().year + 1
+
+# MAX_YEAR moves with the clock, so the stage and its cached years are
+# keyed by the window as well as by the files
+YEAR_WINDOW = f'{MIN_YEAR}-{MAX_YEAR}'
+
+# A year is a 4-digit token that is not glued to other letters or digits
+STANDALONE_YEAR = re.compile(r'(?<!\w)(\d{4})(?!\w)')
+# Fallback for years glued to other text: after a comma or before a period
+FALLBACK_YEAR = re.compile(r',\s*(\d{4})|(\d{4})\.')
+
+@lru_cache(maxsize=8192)
+def extract_year_from_text(text, min_year=MIN_YEAR, max_year=MAX_YEAR):
+    """Extract publication year from text
+
+    Returns the most recent standalone year inside [min_year, max_year],
+    falling back to years attached to a comma or period. Both patterns
+    match in linear time, and results are memoized per text and window.
+    """
+    years = [int(match) for match in STANDALONE_YEAR.findall(text)
+             if min_year <= int(match) <= max_year]
+    if not years:
+        years = [int(after_comma or before_period)
+                 for after_comma, before_period in FALLBACK_YEAR.findall(text)
+                 if min_year <= int(after_comma or before_period) <= max_year]
+    return max(years) if years else None
 
 def clean_text(text):
     """Clean and normalize text"""
@@ -40,348 +58,184 @@ def clean_text(text):
     text = text.strip()
     return text
 
-def parse_journal_articles(text):
-    """Parse journal articles section"""
-    articles = []
-    lines = text.split('\n')
-    current_article = ""
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            if current_article:
-                articles.append(clean_text(current_article))
-                current_article = ""
-            continue
-        
-        # Start of new article (usually starts with quote or author name)
-        if (line.startswith('"') or 
-            any(name in line for name in ['Çağatay', 'Cagatay', 'Çağatay, S', 'Cagatay, S']) or
-            re.match(r'^[A-Z]', line) and not line.startswith('DOI:')):
-            if current_article:
-                articles.append(clean_text(current_article))
-            current_article = line
-        else:
-            if current_article:
-                current_article += " " + line
-    
-    if current_article:
-        articles.append(clean_text(current_article))
-    
-    return [article for article in articles if article.strip()]
+# Section header lines and the section tag they open. None means the
+# lines that follow are not parsed until the next header.
+SECTION_HEADERS = {
+    "Research Grants": "research_grants",
+    "Publications": None,
+    "Journal Articles:": "journal_articles",
+    "Books and Edited Volumes:": "books",
+    "Chapters in Books:": "chapters",
+    "Research Reports and Discussion Papers:": "reports",
+    "Conference Papers:": "conference",
+    "Technical Works:": None,
+    "Invited Speaker:": None,
+    "Poster:": None,
+}
 
-def parse_books_and_volumes(text):
-    """Parse books and edited volumes section"""
-    books = []
-    lines = text.split('\n')
-    current_book = ""
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            if current_book:
-                books.append(clean_text(current_book))
-                current_book = ""
-            continue
-        
-        # Start of new book entry
-        if (re.match(r'^[A-Z]', line) or 
-            'eds.' in line or
-            any(publisher in line.lower() for publisher in ['routledge', 'elma', 'tepge', 'lambert', 'akdeniz'])):
-            if current_book:
-                books.append(clean_text(current_book))
-            current_book = line
-        else:
-            if current_book:
-                current_book += " " + line
-    
-    if current_book:
-        books.append(clean_text(current_book))
-    
-    return [book for book in books if book.strip()]
+# Publication category for each publication section
+SECTION_CATEGORIES = {
+    "journal_articles": "journal",
+    "books": "book",
+    "chapters": "chapter",
+    "reports": "report",
+    "conference": "conference",
+}
 
-def parse_book_chapters(text):
-    """Parse book chapters section"""
-    chapters = []
-    lines = text.split('\n')
-    current_chapter = ""
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            if current_chapter:
-                chapters.append(clean_text(current_chapter))
-                current_chapter = ""
-            continue
-        
-        # Start of new chapter (usually starts with quote)
-        if (line.startswith('"') or 
-            'in ' in line.lower() or
-            any(name in line for name in ['Çağatay', 'Cagatay'])):
-            if current_chapter:
-                chapters.append(clean_text(current_chapter))
-            current_chapter = line
-        else:
-            if current_chapter:
-                current_chapter += " " + line
-    
-    if current_chapter:
-        chapters.append(clean_text(current_chapter))
-    
-    return [chapter for chapter in chapters if chapter.strip()]
+AUTHOR_NAMES = ['Çağatay', 'Cagatay']
+PUBLISHERS = ['routledge', 'elma', 'tepge', 'lambert', 'akdeniz']
+GRANT_ORGANIZATIONS = ['TÜBİTAK', 'BAKA', 'ICMPD', 'AFAD', 'EU', 'Akdeniz', 'OSB', 'ATSO',
+                       'EBRD', 'FEMISE', 'OECD', 'UNDP', 'World Bank', 'FAO']
+CAPITAL_START = re.compile(r'[A-Z]')
 
-def parse_research_reports(text):
-    """Parse research reports and discussion papers section"""
-    reports = []
-    lines = text.split('\n')
-    current_report = ""
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            if current_report:
-                reports.append(clean_text(current_report))
-                current_report = ""
-            continue
-        
-        # Start of new report
-        if (any(name in line for name in ['Çağatay', 'Cagatay']) or
-            re.match(r'^[A-Z]', line)):
-            if current_report:
-                reports.append(clean_text(current_report))
-            current_report = line
-        else:
-            if current_report:
-                current_report += " " + line
-    
-    if current_report:
-        reports.append(clean_text(current_report))
-    
-    return [report for report in reports if report.strip()]
+def mentions_author(line):
+    return any(name in line for name in AUTHOR_NAMES)
+
+# Rules deciding whether a (stripped, non-empty) line starts a new entry.
+# Any other line continues the current entry; a blank line ends it.
+ENTRY_START_RULES = {
+    # Articles usually start with a quoted title or an author name
+    "journal_articles": lambda line: (
+        line.startswith('"') or mentions_author(line)
+        or (CAPITAL_START.match(line) and not line.startswith('DOI:'))),
+    "books": lambda line: (
+        CAPITAL_START.match(line) or 'eds.' in line
+        or any(publisher in line.lower() for publisher in PUBLISHERS)),
+    # Chapters usually start with a quoted title or mention the book "in" ...
+    "chapters": lambda line: (
+        line.startswith('"') or 'in ' in line.lower() or mentions_author(line)),
+    "reports": lambda line: mentions_author(line) or CAPITAL_START.match(line),
+    "conference": lambda line: (
+        mentions_author(line) or CAPITAL_START.match(line) or 'presented' in line.lower()),
+    # Grants usually start with the funding organization
+    "research_grants": lambda line: (
+        any(org in line for org in GRANT_ORGANIZATIONS) or CAPITAL_START.match(line)),
+}
+
+def read_lines(file_path):
+    """Yield the lines of a file, decoding each as UTF-8 with a Latin-1 fallback"""
+    with open(file_path, 'rb') as file:
+        for raw_line in file:
+            try:
+                yield raw_line.decode('utf-8')
+            except UnicodeDecodeError:
+                yield raw_line.decode('latin-1')
+
+def segment_entries(lines):
+    """Split CV lines into entries in a single pass
+
+    Recognizes section headers and entry boundaries as the lines stream by
+    and lazily yields (section, entry text) pairs, so only the entry being
+    assembled is held in memory.
+    """
+    section = None
+    current = ""
 
-def parse_conference_papers(text):
-    """Parse conference papers section"""
-    papers = []
-    lines = text.split('\n')
-    current_paper = ""
-    
     for line in lines:
         line = line.strip()
-        if not line:
-            if current_paper:
-                papers.append(clean_text(current_paper))
-                current_paper = ""
+
+        if line in SECTION_HEADERS:
+            if current:
+                yield section, clean_text(current)
+            section = SECTION_HEADERS[line]
+            current = ""
+            continue
+        if section is None:
             continue
-        
-        # Start of new conference paper
-        if (any(name in line for name in ['Çağatay', 'Cagatay']) or
-            re.match(r'^[A-Z]', line) or
-            'presented' in line.lower()):
-            if current_paper:
-                papers.append(clean_text(current_paper))
-            current_paper = line
-        else:
-            if current_paper:
-                current_paper += " " + line
-    
-    if current_paper:
-        papers.append(clean_text(current_paper))
-    
-    return [paper for paper in papers if paper.strip()]
 
-def parse_research_grants(text):
-    """Parse research grants section"""
-    grants = []
-    lines = text.split('\n')
-    current_grant = ""
-    
-    for line in lines:
-        line = line.strip()
         if not line:
-            if current_grant:
-                grants.append(clean_text(current_grant))
-                current_grant = ""
+            if current:
+                yield section, clean_text(current)
+                current = ""
             continue
-        
-        # Start of new grant (usually starts with TÜBİTAK, BAKA, etc.)
-        if (any(org in line for org in ['TÜBİTAK', 'BAKA', 'ICMPD', 'AFAD', 'EU', 'Akdeniz', 'OSB', 'ATSO', 'EBRD', 'FEMISE', 'OECD', 'UNDP', 'World Bank', 'FAO']) or
-            re.match(r'^[A-Z]', line)):
-            if current_grant:
-                grants.append(clean_text(current_grant))
-            current_grant = line
-        else:
-            if current_grant:
-                current_grant += " " + line
-    
-    if current_grant:
-        grants.append(clean_text(current_grant))
-    
-    return [grant for grant in grants if grant.strip()]
 
-def organize_by_year(publications, category):
-    """Organize publications by year"""
-    year_dict = defaultdict(list)
-    
-    for pub in publications:
-        if not pub.strip():
-            continue
-            
-        year = extract_year_from_text(pub)
-        if year:
-            year_dict[year].append({
-                'text': pub,
-                'category': category,
-                'year': year
-            })
-        else:
-            # If no year found, put in 'unknown' category
-            year_dict['unknown'].append({
-                'text': pub,
-                'category': category,
-                'year': 'unknown'
-            })
-    
-    return year_dict
+        if ENTRY_START_RULES[section](line):
+            if current:
+                yield section, clean_text(current)
+            current = line
+        elif current:
+            current += " " + line
 
-def read_publications_file():
-    """Read and parse the publications.txt file"""
-    file_path = "/Users/mertcagatay/Web Development Projects/SelimCagatayWebpage/publications.txt"
-    
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-    except UnicodeDecodeError:
-        with open(file_path, 'r', encoding='latin-1') as file:
-            content = file.read()
-    
-    # Find section markers
-    sections = {}
-    lines = content.split('\n')
-    
-    current_section = None
-    section_content = []
-    
-    for i, line in enumerate(lines):
-        line = line.strip()
-        
-        if line == "Research Grants":
-            if current_section:
-                sections[current_section] = '\n'.join(section_content)
-            current_section = "research_grants"
-            section_content = []
-        elif line == "Publications":
-            if current_section:
-                sections[current_section] = '\n'.join(section_content)
-            current_section = None
-            section_content = []
-        elif line == "Journal Articles:":
-            if current_section:
-                sections[current_section] = '\n'.join(section_content)
-            current_section = "journal_articles"
-            section_content = []
-        elif line == "Books and Edited Volumes:":
-            if current_section:
-                sections[current_section] = '\n'.join(section_content)
-            current_section = "books"
-            section_content = []
-        elif line == "Chapters in Books:":
-            if current_section:
-                sections[current_section] = '\n'.join(section_content)
-            current_section = "chapters"
-            section_content = []
-        elif line == "Research Reports and Discussion Papers:":
-            if current_section:
-                sections[current_section] = '\n'.join(section_content)
-            current_section = "reports"
-            section_content = []
-        elif line == "Conference Papers:":
-            if current_section:
-                sections[current_section] = '\n'.join(section_content)
-            current_section = "conference"
-            section_content = []
-        elif line in ["Technical Works:", "Invited Speaker:", "Poster:"]:
-            if current_section:
-                sections[current_section] = '\n'.join(section_content)
-            current_section = None
-            section_content = []
-        elif current_section:
-            section_content.append(line)
-    
-    # Don't forget the last section
-    if current_section:
-        sections[current_section] = '\n'.join(section_content)
-    
-    return sections
+    if current:
+        yield section, clean_text(current)
+
+def read_publication_entries(file_path=None):
+    """Stream (section, entry text) pairs from the publications.txt file"""
+    return segment_entries(read_lines(file_path or PUBLICATIONS_TXT_PATH))
+
+# Order of the category counts in publications_data.json
+CATEGORY_ORDER = ['journal', 'book', 'chapter', 'conference', 'report']
+
+class Publication:
+    """One parsed publication; slots keep the per-entry footprint small"""
+    __slots__ = ('text', 'category', 'year')
 
-def main():
+    def __init__(self, text, category, year):
+        self.text = text
+        self.category = category
+        self.year = year
+
+    def to_json(self):
+        return {'text': self.text, 'category': self.category, 'year': self.year}
+
+class PublicationSummary:
+    """Year index, category counts and total, updated as publications arrive"""
+    __slots__ = ('by_year', 'categories', 'total_count')
+
+    def __init__(self):
+        self.by_year = defaultdict(list)
+        self.categories = dict.fromkeys(CATEGORY_ORDER, 0)
+        self.total_count = 0
+
+    def add(self, publication):
+        self.by_year[publication.year].append(publication)
+        self.categories[publication.category] += 1
+        self.total_count += 1
+
+    def sorted_years(self):
+        """Known years, newest first"""
+        return sorted((year for year in self.by_year if year != 'unknown'), reverse=True)
+
+    def to_json(self):
+        return {
+            'years': self.sorted_years(),
+            'publications': dict(self.by_year),
+            'total_count': self.total_count,
+            'categories': self.categories,
+        }
+
+def stage_inputs():
+    """Files this stage reads"""
+    return [PUBLICATIONS_TXT_PATH, __file__]
+
+def main(force=False):
     """Main function to parse publications file and organize publications"""
+    inputs = stage_inputs()
+    outputs = [PUBLICATIONS_JSON_PATH, GRANTS_JSON_PATH]
+    settings = {'year_window': YEAR_WINDOW}
+    if not force and is_stage_current('parse_publications', inputs, outputs, settings):
+        print("publications.txt unchanged - skipping parse")
+        return False
+
     print("Parsing publications.txt file...")
     
-    # Read file sections
-    sections = read_publications_file()
-    
-    # Parse each section
-    all_publications = defaultdict(list)
+    # Parse research grants and publications in one pass over the file,
+    # indexing years and counting categories as each entry arrives
+    summary = PublicationSummary()
     all_grants = []
     
-    # Parse research grants
-    if 'research_grants' in sections:
-        grants = parse_research_grants(sections['research_grants'])
-        all_grants = grants
-        print(f"Found {len(grants)} research grants")
-    
-    # Parse publications sections
-    if 'journal_articles' in sections:
-        articles = parse_journal_articles(sections['journal_articles'])
-        year_dict = organize_by_year(articles, 'journal')
-        for year, pubs in year_dict.items():
-            all_publications[year].extend(pubs)
-    
-    if 'books' in sections:
-        books = parse_books_and_volumes(sections['books'])
-        year_dict = organize_by_year(books, 'book')
-        for year, pubs in year_dict.items():
-            all_publications[year].extend(pubs)
-    
-    if 'chapters' in sections:
-        chapters = parse_book_chapters(sections['chapters'])
-        year_dict = organize_by_year(chapters, 'chapter')
-        for year, pubs in year_dict.items():
-            all_publications[year].extend(pubs)
-    
-    if 'reports' in sections:
-        reports = parse_research_reports(sections['reports'])
-        year_dict = organize_by_year(reports, 'report')
-        for year, pubs in year_dict.items():
-            all_publications[year].extend(pubs)
-    
-    if 'conference' in sections:
-        papers = parse_conference_papers(sections['conference'])
-        year_dict = organize_by_year(papers, 'conference')
-        for year, pubs in year_dict.items():
-            all_publications[year].extend(pubs)
+    # Years of unchanged entries come from the entry cache
+    with EntryCache('parse_publications', [__file__]) as cache:
+        for section, entry in read_publication_entries():
+            if section == 'research_grants':
+                all_grants.append(entry)
+                continue
+            
+            year = cache.get((section, entry, YEAR_WINDOW), lambda: extract_year_from_text(entry) or 'unknown')
+            summary.add(Publication(entry, SECTION_CATEGORIES[section], year))
+    print(f"Entry cache: {cache.summary()}")
     
-    # Sort years in descending order
-    sorted_years = sorted([year for year in all_publications.keys() if year != 'unknown'], reverse=True)
-    
-    # Create output structure for publications
-    organized_publications = {
-        'years': sorted_years,
-        'publications': dict(all_publications),
-        'total_count': sum(len(pubs) for pubs in all_publications.values()),
-        'categories': {
-            'journal': sum(1 for year_pubs in all_publications.values() 
-                          for pub in year_pubs if pub['category'] == 'journal'),
-            'book': sum(1 for year_pubs in all_publications.values() 
-                       for pub in year_pubs if pub['category'] == 'book'),
-            'chapter': sum(1 for year_pubs in all_publications.values() 
-                          for pub in year_pubs if pub['category'] == 'chapter'),
-            'conference': sum(1 for year_pubs in all_publications.values() 
-                             for pub in year_pubs if pub['category'] == 'conference'),
-            'report': sum(1 for year_pubs in all_publications.values() 
-                         for pub in year_pubs if pub['category'] == 'report')
-        }
-    }
+    print(f"Found {len(all_grants)} research grants")
     
     # Create output structure for research grants
     organized_grants = {
@@ -389,25 +243,29 @@ def main():
         'total_count': len(all_grants)
     }
     
-    # Save publications to JSON file
-    publications_output_path = "/Users/mertcagatay/Web Development Projects/SelimCagatayWebpage/publications_data.json"
-    with open(publications_output_path, 'w', encoding='utf-8') as f:
-        json.dump(organized_publications, f, ensure_ascii=False, indent=2)
+    # Save publications to JSON file (left untouched if nothing changed)
+    publications_output_path = PUBLICATIONS_JSON_PATH
+    write_if_changed(publications_output_path,
+                     json.dumps(summary.to_json(), ensure_ascii=False, indent=2,
+                                default=Publication.to_json))
     
     # Save research grants to JSON file
-    grants_output_path = "/Users/mertcagatay/Web Development Projects/SelimCagatayWebpage/research_grants_data.json"
-    with open(grants_output_path, 'w', encoding='utf-8') as f:
-        json.dump(organized_grants, f, ensure_ascii=False, indent=2)
-    
-    print(f"Parsed {organized_publications['total_count']} publications:")
-    print(f"- Journal Articles: {organized_publications['categories']['journal']}")
-    print(f"- Books/Edited Volumes: {organized_publications['categories']['book']}")
-    print(f"- Book Chapters: {organized_publications['categories']['chapter']}")
-    print(f"- Conference Papers: {organized_publications['categories']['conference']}")
-    print(f"- Research Reports: {organized_publications['categories']['report']}")
+    grants_output_path = GRANTS_JSON_PATH
+    write_if_changed(grants_output_path,
+                     json.dumps(organized_grants, ensure_ascii=False, indent=2))
+    record_stage('parse_publications', inputs, outputs, settings)
+    
+    sorted_years = summary.sorted_years()
+    print(f"Parsed {summary.total_count} publications:")
+    print(f"- Journal Articles: {summary.categories['journal']}")
+    print(f"- Books/Edited Volumes: {summary.categories['book']}")
+    print(f"- Book Chapters: {summary.categories['chapter']}")
+    print(f"- Conference Papers: {summary.categories['conference']}")
+    print(f"- Research Reports: {summary.categories['report']}")
     print(f"Years covered: {min(sorted_years)} - {max(sorted_years)}")
     print(f"Publications data saved to: {publications_output_path}")
     print(f"Research grants data saved to: {grants_output_path}")
+    return True
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(force='--force' in sys.argv[1:])
\ No newline at end of file
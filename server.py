@@ -1,29 +1,543 @@
 #!/usr/bin/env python3
 """
 Simple HTTP server for local development with proper cache headers
-Usage: python server.py [port]
+Usage: python server.py [port] [--workers N] [--keep-alive SECONDS] [--dev] [--cache-size MB] [--watch]
 Default port: 8000
+Precompressed .br/.gz variants written by compress_assets.py are served to
+clients that accept them, and content-hashed assets written by
+fingerprint_assets.py may be cached for a year. With --watch, edits to
+publications.txt, the templates or the build scripts rebuild the affected
+pages and open pages reload themselves.
 """
 
+import argparse
+import email.utils
 import http.server
+import io
+import select
+import socket
 import socketserver
-import sys
 import os
+import threading
+import types
+import urllib.parse
+import uuid
+from collections import OrderedDict
+from http import HTTPStatus
+
+from compress_assets import COMPRESSIBLE_EXTENSIONS, ENCODINGS, is_up_to_date
+from fingerprint_assets import FINGERPRINT_PATTERN
+from site_watcher import LIVE_RELOAD_PATH, LiveReload, SiteWatcher, inject_live_reload
+
+DEFAULT_WORKERS = 16
+KEEP_ALIVE_TIMEOUT = 2  # seconds an idle keep-alive connection is kept open
+EVENT_STREAM_HEARTBEAT = 15  # seconds between keep-alive comments on the reload stream
+
+# Production Cache-Control policy by file extension. Pages and data files are
+# always revalidated (cheap with ETags), static assets may be reused for a while.
+CACHE_POLICIES = {
+    '.html': 'no-cache',
+    '.json': 'no-cache',
+    '.xml': 'no-cache',
+    '.txt': 'no-cache',
+    '.css': 'public, max-age=3600',
+    '.js': 'public, max-age=3600',
+    '.pdf': 'public, max-age=86400',
+    '.jpg': 'public, max-age=604800',
+    '.jpeg': 'public, max-age=604800',
+    '.png': 'public, max-age=604800',
+    '.gif': 'public, max-age=604800',
+    '.webp': 'public, max-age=604800',
+    '.svg': 'public, max-age=604800',
+    '.ico': 'public, max-age=604800',
+    '.woff2': 'public, max-age=604800',
+}
+DEFAULT_CACHE_POLICY = 'public, max-age=3600'
+
+# Content-hashed files written by fingerprint_assets.py never change
+IMMUTABLE_CACHE_POLICY = 'public, max-age=31536000, immutable'
+
+# Files that must never be cached by the browser, whatever their extension
+NO_CACHE_FILES = {'sw.js'}
+
+# Requests asking for more ranges than this get the whole file instead
+MAX_RANGES = 16
+
+def parse_accept_encoding(header):
+    """Map each content coding in an Accept-Encoding header to its q-value"""
+    qualities = {}
+    for item in header.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities
+
+def parse_range_header(header, size):
+    """Parse a bytes Range header into a list of inclusive (start, end) pairs
+
+    Returns None when the header should be ignored (malformed, not in bytes
+    or asking for too many ranges) and an empty list when no range overlaps
+    the file, which must be answered with 416.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not spec.strip():
+        return None
+
+    ranges = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        first, dash, last = part.partition('-')
+        first, last = first.strip(), last.strip()
+        if not dash or not (first or last):
+            return None
+        if (first and not first.isdigit()) or (last and not last.isdigit()):
+            return None
+        if not first:
+            # Suffix range: the last N bytes; an empty file has none
+            length = int(last)
+            if length == 0 or size == 0:
+                continue
+            ranges.append((max(size - length, 0), size - 1))
+            continue
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start >= size:
+            continue
+        end = int(last) if last else size - 1
+        ranges.append((start, min(end, size - 1)))
+
+    if len(ranges) > MAX_RANGES:
+        return None
+    return ranges
+
+def client_disconnected(connection):
+    """True if the peer has closed a connection we only write to
+
+    A write to a closed connection may still succeed into the send
+    buffer, so streams check for the end of the peer's input instead.
+    """
+    readable, _, _ = select.select([connection], [], [], 0)
+    if not readable:
+        return False
+    try:
+        return connection.recv(1, socket.MSG_PEEK) == b''
+    except OSError:
+        return True
+
+class CachedContent(io.BytesIO):
+    """In-memory file over bytes that may be shared with the content cache
+
+    data keeps the bytes themselves, so ranges can be sliced from them
+    without copying (getbuffer() would first copy shared bytes).
+    """
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.data = data
+
+class ContentCache:
+    """Thread-safe LRU cache of file bytes, capped by total size
+
+    Entries are keyed by path and remember the inode, mtime and size they
+    were read with, so a file that is rewritten or replaced is reloaded.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        # A single file may use at most an eighth of the cache
+        self.max_entry_bytes = max_bytes // 8
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def signature(fs):
+        return (fs.st_ino, fs.st_mtime_ns, fs.st_size)
+
+    def open(self, path):
+        """Return (file object, stat result) for path, served from memory if cached"""
+        fs = os.stat(path)
+        data = self.lookup(path, fs)
+        if data is not None:
+            return CachedContent(data), fs
+
+        f = open(path, 'rb')
+        try:
+            fs = os.fstat(f.fileno())
+            if fs.st_size > self.max_entry_bytes:
+                return f, fs
+            data = f.read()
+        except:
+            f.close()
+            raise
+        f.close()
+        # Only keep the bytes if the file did not change while being read
+        if len(data) == fs.st_size:
+            self.store(path, fs, data)
+        return CachedContent(data), fs
+
+    def lookup(self, path, fs):
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry[0] == self.signature(fs):
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                # Stale entry: the file was modified or replaced
+                self.discard(path)
+            self.misses += 1
+            return None
+
+    def store(self, path, fs, data):
+        with self.lock:
+            self.discard(path)
+            self.entries[path] = (self.signature(fs), data)
+            self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def discard(self, path):
+        """Drop an entry; the caller must hold the lock"""
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self.total_bytes -= len(entry[1])
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+            }
 
 class NoCacheHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-    """HTTP request handler that disables caching for development"""
-    
+    """HTTP request handler with conditional GET and a production cache policy
+
+    With dev_mode enabled every response carries no-cache headers instead,
+    so local edits always show up on reload.
+    """
+
+    dev_mode = False
+    content_cache = None
+    # Set in watch mode: pages get the reload client and can subscribe to it
+    live_reload = None
+
+    # Byte ranges chosen by send_head for copyfile to transfer
+    ranges = None
+    range_parts = None
+    range_trailer = b''
+
+    # Keep connections open between requests so pages and their assets
+    # can share one socket; idle sockets are dropped after the timeout.
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEP_ALIVE_TIMEOUT
+
     def end_headers(self):
-        # Add cache-busting headers
-        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-        self.send_header('Pragma', 'no-cache')
-        self.send_header('Expires', '0')
+        if self.dev_mode:
+            # Add cache-busting headers
+            self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
+            self.send_header('Pragma', 'no-cache')
+            self.send_header('Expires', '0')
         super().end_headers()
 
+    def do_GET(self):
+        if self.live_reload is not None and urllib.parse.urlsplit(self.path).path == LIVE_RELOAD_PATH:
+            # Streams only wait on the site watcher: they take no request slot
+            self.send_reload_events()
+            return
+        with self.server.request_slots:
+            super().do_GET()
+
+    def do_HEAD(self):
+        with self.server.request_slots:
+            super().do_HEAD()
+
+    def send_reload_events(self):
+        """Server-Sent Events stream with a 'reload' event per site change
+
+        The stream holds its connection thread until the page goes away.
+        """
+        self.close_connection = True
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            # Reconnect quickly after a server restart
+            self.wfile.write(b"retry: 1000\n\n")
+            generation = self.live_reload.generation
+            while True:
+                latest = self.live_reload.wait(generation, EVENT_STREAM_HEARTBEAT)
+                if latest is None or client_disconnected(self.connection):
+                    break
+                if latest != generation:
+                    generation = latest
+                    self.wfile.write(f"event: reload\ndata: {generation}\n\n".encode('ascii'))
+                else:
+                    self.wfile.write(b": ping\n\n")
+        except OSError:
+            pass
+
+    def send_head(self):
+        """Send headers for a file, answering conditional requests with 304"""
+        # The handler is reused for every request on a keep-alive connection
+        self.ranges = None
+        self.range_parts = None
+        self.range_trailer = b''
+
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            if not urllib.parse.urlsplit(self.path).path.endswith('/'):
+                # Let the base class send its trailing-slash redirect
+                return super().send_head()
+            for index in "index.html", "index.htm":
+                index = os.path.join(path, index)
+                if os.path.isfile(index):
+                    path = index
+                    break
+            else:
+                return self.list_directory(path)
+
+        if path.endswith("/"):
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        inject = self.live_reload is not None and path.endswith('.html')
+        content_path, encoding = (path, None) if inject else self.select_encoding(path)
+        try:
+            f, fs = self.open_file(content_path)
+            if inject:
+                f, fs = self.add_live_reload(f, fs)
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        try:
+            etag = self.make_etag(fs, encoding)
+
+            if self.is_not_modified(fs, etag):
+                f.close()
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_validators(path, fs, etag)
+                self.send_encoding_headers(path, encoding)
+                self.end_headers()
+                return None
+
+            ctype = self.guess_type(path)
+            ranges = self.requested_ranges(fs, etag)
+            if ranges == []:
+                f.close()
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{fs.st_size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+
+            if ranges is None:
+                self.ranges = [(0, fs.st_size - 1)]
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(fs.st_size))
+            elif len(ranges) == 1:
+                start, end = ranges[0]
+                self.ranges = ranges
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{fs.st_size}")
+                self.send_header("Content-Length", str(end - start + 1))
+            else:
+                self.prepare_multipart(ranges, ctype, fs.st_size)
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_validators(path, fs, etag)
+            self.send_encoding_headers(path, encoding)
+            self.end_headers()
+            return f
+        except:
+            f.close()
+            raise
+
+    def requested_ranges(self, fs, etag):
+        """Byte ranges to send for this request, or None for the whole file"""
+        range_header = self.headers.get('Range')
+        if range_header is None or self.command != 'GET':
+            return None
+
+        if_range = self.headers.get('If-Range')
+        if if_range is not None:
+            # Only honour the range if the client's copy is still current
+            if if_range.strip().startswith(('"', 'W/')):
+                if if_range.strip() != etag:
+                    return None
+            elif if_range.strip() != self.date_time_string(fs.st_mtime):
+                return None
+
+        return parse_range_header(range_header, fs.st_size)
+
+    def prepare_multipart(self, ranges, ctype, size):
+        """Send headers for a multipart/byteranges response and stage its parts"""
+        boundary = uuid.uuid4().hex
+        self.ranges = ranges
+        self.range_parts = [
+            (f"\r\n--{boundary}\r\n"
+             f"Content-Type: {ctype}\r\n"
+             f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n").encode('latin-1')
+            for start, end in ranges
+        ]
+        self.range_trailer = f"\r\n--{boundary}--\r\n".encode('latin-1')
+        length = sum(len(part) for part in self.range_parts)
+        length += sum(end - start + 1 for start, end in ranges)
+        length += len(self.range_trailer)
+
+        self.send_response(HTTPStatus.PARTIAL_CONTENT)
+        self.send_header("Content-Type", f"multipart/byteranges; boundary={boundary}")
+        self.send_header("Content-Length", str(length))
+
+    def copyfile(self, source, outputfile):
+        """Send the ranges chosen by send_head, zero-copy for files on disk"""
+        if self.ranges is None:
+            # Directory listings and other generated bodies
+            return super().copyfile(source, outputfile)
+
+        for index, (start, end) in enumerate(self.ranges):
+            if self.range_parts:
+                outputfile.write(self.range_parts[index])
+            self.send_range(source, outputfile, start, end - start + 1)
+        if self.range_parts:
+            outputfile.write(self.range_trailer)
+
+    def send_range(self, source, outputfile, offset, count):
+        """Write count bytes of source starting at offset"""
+        if count <= 0:
+            return
+        if isinstance(source, CachedContent):
+            # In memory: write a view of the bytes without copying them
+            outputfile.write(memoryview(source.data)[offset:offset + count])
+            return
+        outputfile.flush()
+        # socket.sendfile uses os.sendfile where available and falls back
+        # to plain reads and sends elsewhere
+        self.connection.sendfile(source, offset, count)
+
+    def open_file(self, path):
+        """Open a file for sending, through the content cache when enabled"""
+        if self.content_cache is not None:
+            return self.content_cache.open(path)
+        f = open(path, 'rb')
+        try:
+            return f, os.fstat(f.fileno())
+        except:
+            f.close()
+            raise
+
+    def add_live_reload(self, f, fs):
+        """Swap an HTML file for a copy carrying the live reload client
+
+        Returns the copy and stat-like details matching it, so the length
+        and validators describe what is actually sent.
+        """
+        with f:
+            data = inject_live_reload(f.read())
+        return CachedContent(data), types.SimpleNamespace(
+            st_size=len(data), st_mtime=fs.st_mtime, st_mtime_ns=fs.st_mtime_ns)
+
+    def select_encoding(self, path):
+        """Pick the best precompressed variant of path the client accepts
+
+        Returns the file to send and its Content-Encoding (None for the
+        original file). Variants older than the original are ignored.
+        """
+        if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return path, None
+
+        accepted = parse_accept_encoding(self.headers.get('Accept-Encoding', ''))
+        default_quality = accepted.get('*', 0.0)
+        best = (path, None)
+        best_quality = 0.0
+        for encoding, suffix in ENCODINGS:
+            quality = accepted.get(encoding, default_quality)
+            if quality <= best_quality:
+                continue
+            variant = path + suffix
+            if is_up_to_date(path, variant):
+                best = (variant, encoding)
+                best_quality = quality
+        return best
+
+    def send_encoding_headers(self, path, encoding):
+        """Send Content-Encoding and Vary for negotiable resources"""
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        if os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+            self.send_header("Vary", "Accept-Encoding")
+
+    def make_etag(self, fs, encoding=None):
+        """Strong ETag derived from file size and modification time
+
+        Each content coding is a different representation, so it gets
+        its own ETag.
+        """
+        if encoding is not None:
+            return f'"{fs.st_size:x}-{fs.st_mtime_ns:x}-{encoding}"'
+        return f'"{fs.st_size:x}-{fs.st_mtime_ns:x}"'
+
+    def is_not_modified(self, fs, etag):
+        """Check If-None-Match, falling back to If-Modified-Since"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            # If-None-Match takes precedence over If-Modified-Since and uses
+            # the weak comparison function (RFC 9110), so ignore any W/ prefix
+            tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags
+
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since is None:
+            return False
+        try:
+            ims = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, IndexError, OverflowError, ValueError):
+            # ignore ill-formed values
+            return False
+        return int(fs.st_mtime) <= ims.timestamp()
+
+    def send_validators(self, path, fs, etag):
+        """Send ETag, Last-Modified and the cache policy for the file"""
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.date_time_string(fs.st_mtime))
+        if not self.dev_mode:
+            self.send_header("Cache-Control", self.cache_policy(path))
+
+    def cache_policy(self, path):
+        """Production Cache-Control value for a file"""
+        if os.path.basename(path) in NO_CACHE_FILES:
+            return 'no-cache'
+        if FINGERPRINT_PATTERN.search(os.path.basename(path)):
+            return IMMUTABLE_CACHE_POLICY
+        extension = os.path.splitext(path)[1].lower()
+        return CACHE_POLICIES.get(extension, DEFAULT_CACHE_POLICY)
+
     def guess_type(self, path):
         """Override to set proper MIME types"""
-        mimetype, encoding = super().guess_type(path)
-        
+        mimetype = super().guess_type(path)
+
         # Ensure proper MIME types for web files
         if path.endswith('.css'):
             mimetype = 'text/css'
@@ -31,27 +545,97 @@ class NoCacheHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             mimetype = 'application/javascript'
         elif path.endswith('.html'):
             mimetype = 'text/html'
-            
-        return mimetype, encoding
+
+        return mimetype
+
+class ThreadedHTTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """TCP server with a thread per connection and a cap on concurrent requests
+
+    Idle keep-alive connections and live reload streams only hold their own
+    thread, so they never keep other visitors waiting; at most `workers`
+    requests are processed at a time and the rest wait for a free slot.
+    """
+
+    allow_reuse_address = True
+    # Connection threads never hold up Ctrl+C
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, workers=DEFAULT_WORKERS):
+        self.workers = workers
+        self.request_slots = threading.BoundedSemaphore(workers)
+        super().__init__(server_address, handler_class)
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Serve the website for local development')
+    parser.add_argument('port', nargs='?', type=int, default=8000,
+                        help='port to listen on (default: 8000)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'number of requests processed at a time (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--keep-alive', type=float, default=KEEP_ALIVE_TIMEOUT, metavar='SECONDS',
+                        help=f'close idle connections after SECONDS (default: {KEEP_ALIVE_TIMEOUT})')
+    parser.add_argument('--dev', action='store_true',
+                        help='development mode: disable browser caching entirely')
+    parser.add_argument('--cache-size', type=int, default=0, metavar='MB',
+                        help='keep up to MB megabytes of hot files in memory (default: 0, disabled)')
+    parser.add_argument('--watch', action='store_true',
+                        help='rebuild pages when their sources change and reload open pages')
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.keep_alive <= 0:
+        parser.error('--keep-alive must be positive')
+    if args.cache_size < 0:
+        parser.error('--cache-size cannot be negative')
+    return args
 
 def main():
-    # Get port from command line or use default
-    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
-    
+    args = parse_args()
+    port = args.port
+
+    NoCacheHTTPRequestHandler.dev_mode = args.dev
+    NoCacheHTTPRequestHandler.timeout = args.keep_alive
+    if args.cache_size:
+        NoCacheHTTPRequestHandler.content_cache = ContentCache(args.cache_size * 1024 * 1024)
+
     # Change to the directory containing this script
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
-    
+
+    watcher = None
+    if args.watch:
+        NoCacheHTTPRequestHandler.live_reload = LiveReload()
+        watcher = SiteWatcher(NoCacheHTTPRequestHandler.live_reload)
+
     # Create server
-    with socketserver.TCPServer(("", port), NoCacheHTTPRequestHandler) as httpd:
+    with ThreadedHTTPServer(("", port), NoCacheHTTPRequestHandler, workers=args.workers) as httpd:
         print(f"🚀 Development server running at http://localhost:{port}")
         print(f"📂 Serving files from: {os.getcwd()}")
-        print(f"🔄 Cache-busting enabled - you'll always see the latest changes")
+        print(f"🧵 Serving up to {args.workers} requests at a time "
+              f"(HTTP/1.1 keep-alive, {args.keep_alive:g}s idle timeout)")
+        if args.dev:
+            print(f"🔄 Cache-busting enabled - you'll always see the latest changes")
+        else:
+            print(f"📦 Production caching enabled - ETag/Last-Modified with per-type Cache-Control")
+        if args.cache_size:
+            print(f"🧠 In-memory content cache: up to {args.cache_size} MB")
+        if watcher is not None:
+            print(f"👀 Watching sources - pages rebuild and reload on change")
+            watcher.start()
         print(f"⏹️  Press Ctrl+C to stop the server")
-        
+
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
             print(f"\n✅ Server stopped")
+            if watcher is not None:
+                watcher.stop()
+                NoCacheHTTPRequestHandler.live_reload.close()
+            cache = NoCacheHTTPRequestHandler.content_cache
+            if cache is not None:
+                stats = cache.stats()
+                print(f"🧠 Content cache: {stats['hits']} hits, {stats['misses']} misses "
+                      f"({stats['hit_rate']:.0%} hit rate), {stats['entries']} files / "
+                      f"{stats['bytes'] / 1024 / 1024:.1f} MB cached")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
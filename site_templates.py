@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared page templates for the generated pages
+Templates live in templates/ (partials in templates/partials/) and use two
+tags: {{ name }} inserts a context value (dotted names look inside dicts,
+where a missing key renders as nothing) and {{> partial }} includes a
+partial. Each template is parsed once into a list of render steps. Partials
+whose inputs are all plain values are rendered once per build and reused
+by every page that includes them with the same values.
+Context values may be callables taking a write function; they stream their
+output straight into the page instead of being rendered to a string.
+"""
+
+import os
+import re
+import threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_DIR = os.path.join(BASE_DIR, 'templates')
+
+TAG = re.compile(r'\{\{\s*(>?)\s*([\w.]+)\s*\}\}')
+
+def resolve(context, path):
+    """Look up a dotted name in the render context"""
+    name, *keys = path.split('.')
+    value = context[name]
+    for key in keys:
+        value = value.get(key, '')
+    return value
+
+class Template:
+    """A template parsed into render steps"""
+
+    def __init__(self, name, source, templates):
+        self.name = name
+        self.templates = templates
+        self.steps = []
+        self.variables = []
+        self.partials = []
+
+        position = 0
+        for match in TAG.finditer(source):
+            if match.start() > position:
+                self.steps.append(self.compile_text(source[position:match.start()]))
+            is_partial, path = match.groups()
+            if is_partial:
+                self.partials.append(path)
+                self.steps.append(self.compile_partial(path))
+            else:
+                self.variables.append(path)
+                self.steps.append(self.compile_variable(path))
+            position = match.end()
+        if position < len(source):
+            self.steps.append(self.compile_text(source[position:]))
+
+    @staticmethod
+    def compile_text(text):
+        return lambda write, context: write(text)
+
+    @staticmethod
+    def compile_variable(path):
+        def render_variable(write, context):
+            value = resolve(context, path)
+            if callable(value):
+                value(write)
+            else:
+                write(str(value))
+        return render_variable
+
+    def compile_partial(self, name):
+        return lambda write, context: self.templates.render_partial(name, write, context)
+
+    def render(self, write, context):
+        for step in self.steps:
+            step(write, context)
+
+class TemplateSet:
+    """Loads templates once and caches rendered partials for the build"""
+
+    def __init__(self, directory=TEMPLATE_DIR):
+        self.directory = directory
+        self.compiled = {}
+        self.rendered_partials = {}
+        self.lock = threading.Lock()
+
+    def get(self, name):
+        """Compiled template by name (e.g. 'layout' or 'partials/footer')"""
+        template = self.compiled.get(name)
+        if template is None:
+            with open(os.path.join(self.directory, name + '.html'), 'r', encoding='utf-8') as f:
+                source = f.read()
+            # The file's final newline belongs to the file, not the template
+            if source.endswith('\n'):
+                source = source[:-1]
+            template = Template(name, source, self)
+            with self.lock:
+                self.compiled.setdefault(name, template)
+        return template
+
+    def clear(self):
+        """Forget compiled templates and rendered partials after an edit"""
+        with self.lock:
+            self.compiled.clear()
+            self.rendered_partials.clear()
+
+    def all_variables(self, name):
+        """Variables used by a template and every partial it includes"""
+        template = self.get(name)
+        variables = list(template.variables)
+        for partial in template.partials:
+            variables.extend(self.all_variables('partials/' + partial))
+        return variables
+
+    def render(self, name, write, context):
+        self.get(name).render(write, context)
+
+    def render_partial(self, name, write, context):
+        """Render a partial, reusing earlier output for the same input values"""
+        name = 'partials/' + name
+        values = tuple(resolve(context, path) for path in self.all_variables(name))
+        if any(callable(value) for value in values):
+            # Streaming content cannot be cached
+            self.render(name, write, context)
+            return
+
+        key = (name, values)
+        text = self.rendered_partials.get(key)
+        if text is None:
+            fragments = []
+            self.render(name, fragments.append, context)
+            text = ''.join(fragments)
+            with self.lock:
+                self.rendered_partials[key] = text
+        write(text)
+
+def template_files(directory=TEMPLATE_DIR):
+    """Paths of every template, for build stages that depend on them"""
+    paths = [os.path.join(directory, 'layout.html'), os.path.abspath(__file__)]
+    partial_dir = os.path.join(directory, 'partials')
+    paths.extend(os.path.join(partial_dir, name) for name in sorted(os.listdir(partial_dir)))
+    return paths
+
+# Shared by every generator running in this process (one build)
+templates = TemplateSet()
+
+def render_page(write, title, description, keywords, active, main, scripts='', footer='footer'):
+    """Render a full site page through the shared layout
+
+    active is the page's key in the navigation (e.g. 'publications'),
+    main and scripts are strings or callables taking a write function.
+    footer names the footer partial: 'footer' or 'contact_footer', the one
+    the hand-written pages use.
+    """
+    context = {
+        'title': title,
+        'description': description,
+        'keywords': keywords,
+        'active': {active: ' active'},
+        'main': main,
+        'scripts': scripts,
+    }
+    context['footer'] = lambda write: templates.render_partial(footer, write, context)
+    templates.render('layout', write, context)
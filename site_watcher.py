@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Watch mode for the development server
+SiteWatcher checks the build inputs (publications.txt, the generated JSON,
+templates, stylesheets and scripts, and the build scripts themselves) for
+changes and re-runs only the stages that read a changed file, in-process
+and in build order. When a served page or asset changes, LiveReload tells
+every open page to reload over Server-Sent Events.
+"""
+
+import glob
+import importlib
+import os
+import threading
+import time
+import traceback
+
+import dedup_publications
+import entry_formatter
+import fingerprint_assets
+import generate_gallery_html
+import generate_publications_html
+import generate_research_grants_html
+import generate_service_worker
+import image_index
+import matching
+import parse_publications
+import site_templates
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Build stages in dependency order; each has stage_inputs() and main()
+STAGES = [fingerprint_assets, parse_publications, dedup_publications,
+          generate_publications_html, generate_research_grants_html, generate_gallery_html,
+          generate_service_worker]
+
+# Modules the stages import from; editing one reloads every stage
+SHARED_MODULES = [site_templates, entry_formatter, image_index, matching]
+
+# Files whose changes are pushed to open pages
+SERVED_PATTERNS = ['*.html', 'publications/*.html', 'css/*.css', 'js/*.js']
+
+POLL_INTERVAL = 0.5  # seconds between checks of the watched files
+
+LIVE_RELOAD_PATH = '/__livereload'
+
+# Injected before </body> of every HTML page served in watch mode
+LIVE_RELOAD_SCRIPT = (
+    "<script>new EventSource('" + LIVE_RELOAD_PATH + "')"
+    ".addEventListener('reload', () => location.reload());</script>\n"
+).encode('utf-8')
+
+def inject_live_reload(html):
+    """Add the live reload client to an HTML document (bytes)
+
+    Fragments without a </body>, such as the publication year shards
+    inserted into a page, are returned unchanged.
+    """
+    position = html.rfind(b'</body>')
+    if position == -1:
+        return html
+    return html[:position] + LIVE_RELOAD_SCRIPT + html[position:]
+
+class LiveReload:
+    """Wakes up the event stream of every connected page when the site changes"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.generation = 0
+        self.closed = False
+
+    def notify(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def close(self):
+        """Release every waiting stream, e.g. on server shutdown"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def wait(self, seen, timeout):
+        """Wait until the generation moves past seen; returns None once closed"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.closed or self.generation != seen, timeout)
+            return None if self.closed else self.generation
+
+def file_signature(path):
+    try:
+        fs = os.stat(path)
+    except OSError:
+        return None
+    return (fs.st_mtime_ns, fs.st_size)
+
+class SiteWatcher(threading.Thread):
+    """Background thread that rebuilds changed stages and triggers reloads"""
+
+    def __init__(self, live_reload, root=BASE_DIR, interval=POLL_INTERVAL):
+        super().__init__(name='site-watcher', daemon=True)
+        self.live_reload = live_reload
+        self.root = root
+        self.interval = interval
+        self.input_state = {}
+        self.served_state = {}
+        self.stopped = threading.Event()
+
+    def stop(self):
+        self.stopped.set()
+
+    def build_inputs(self):
+        return {os.path.abspath(path) for module in STAGES for path in module.stage_inputs()}
+
+    def served_files(self):
+        return {path for pattern in SERVED_PATTERNS
+                for path in glob.glob(os.path.join(self.root, pattern))}
+
+    @staticmethod
+    def changed(state, paths):
+        """Paths whose signature differs from the one in state, updating state"""
+        changed = set()
+        for path in paths:
+            signature = file_signature(path)
+            if path not in state or state[path] != signature:
+                changed.add(path)
+            state[path] = signature
+        return changed
+
+    def run(self):
+        # Catch up with edits made while the server was down; stages whose
+        # inputs are unchanged skip themselves
+        self.run_stages(set(self.build_inputs()))
+        self.changed(self.input_state, self.build_inputs())
+        self.changed(self.served_state, self.served_files())
+
+        while not self.stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                traceback.print_exc()
+
+    def check(self):
+        """Rebuild what changed since the last check, then reload open pages"""
+        changed = self.changed(self.input_state, self.build_inputs())
+        if changed:
+            names = ', '.join(sorted(os.path.relpath(path, self.root) for path in changed))
+            print(f"🔁 Changed: {names}")
+            start = time.perf_counter()
+            self.reload_code(changed)
+            if self.run_stages(changed):
+                print(f"✅ Rebuilt in {time.perf_counter() - start:.2f}s")
+
+        if self.changed(self.served_state, self.served_files()):
+            self.live_reload.notify()
+
+    def reload_code(self, changed):
+        """Pick up edits to the build scripts and templates"""
+        shared = [module for module in SHARED_MODULES
+                  if os.path.abspath(module.__file__) in changed]
+        if shared:
+            # Generators hold references into the shared modules: reload them all
+            for module in shared:
+                importlib.reload(module)
+            for module in STAGES:
+                importlib.reload(module)
+            return
+        for module in STAGES:
+            if os.path.abspath(module.__file__) in changed:
+                importlib.reload(module)
+        if any(path.endswith('.html') for path in changed):
+            site_templates.templates.clear()
+
+    def run_stages(self, changed):
+        """Run, in order, every stage reading a changed file
+
+        Outputs written by a stage count as changes for the stages after it.
+        Returns False if a stage failed, leaving later stages for the next edit.
+        """
+        for module in STAGES:
+            inputs = {os.path.abspath(path) for path in module.stage_inputs()}
+            if changed.isdisjoint(inputs):
+                continue
+            try:
+                module.main()
+            except Exception:
+                print(f"❌ {module.__name__} failed:")
+                traceback.print_exc()
+                return False
+            changed |= self.changed(self.input_state, self.build_inputs())
+        return True
@@ -1,53 +1,172 @@
 // Service Worker for Academic Website
-// Provides offline functionality and caching
-
-const CACHE_NAME = 'academic-website-v1';
-const urlsToCache = [
-    '/',
-    '/index.html',
-    '/cv.html',
-    '/publications.html',
-    '/gallery.html',
-    '/css/style.css',
-    '/js/script.js',
-    '/images/profile-photo.jpg',
-    '/assets/cv.pdf'
+// Generated by generate_service_worker.py - do not edit by hand
+
+const PRECACHE_NAME = 'precache';
+const GALLERY_CACHE_NAME = 'gallery-images';
+const FRAGMENT_PREFIXES = ["/publications/"];
+const GALLERY_PREFIXES = ["/images/gallery/", "/images/derivatives/"];
+const GALLERY_CACHE_ENTRIES = 120;
+
+// URL and content revision of every precached file
+const PRECACHE_MANIFEST = [
+    {"url": "/assets/cv.pdf", "revision": "74f103dd64"},
+    {"url": "/css/style.6bcf3c135a.css", "revision": "6bcf3c135a"},
+    {"url": "/cv.html", "revision": "665bcb4adf"},
+    {"url": "/gallery.html", "revision": "5a3ba2c2c7"},
+    {"url": "/images/profile-photo.jpg", "revision": "0976f4b2ad"},
+    {"url": "/", "revision": "1b9b2396ee"},
+    {"url": "/index.html", "revision": "1b9b2396ee"},
+    {"url": "/js/script.e981de8cc5.js", "revision": "e981de8cc5"},
+    {"url": "/manifest.json", "revision": "5d27728652"},
+    {"url": "/publications.html", "revision": "9154ac5bee"},
+    {"url": "/publications/1996.html", "revision": "7262913c23"},
+    {"url": "/publications/1998.html", "revision": "2ad3e8659d"},
+    {"url": "/publications/1999.html", "revision": "588043ea2a"},
+    {"url": "/publications/2000.html", "revision": "37bf1e4cdf"},
+    {"url": "/publications/2001.html", "revision": "d63b9a1131"},
+    {"url": "/publications/2002.html", "revision": "e1f241c1a2"},
+    {"url": "/publications/2003.html", "revision": "26fbb76a02"},
+    {"url": "/publications/2004.html", "revision": "7a01f95911"},
+    {"url": "/publications/2005.html", "revision": "ffc98895d8"},
+    {"url": "/publications/2006.html", "revision": "a9f333368d"},
+    {"url": "/publications/2007.html", "revision": "eae8ff53df"},
+    {"url": "/publications/2008.html", "revision": "37538d0b62"},
+    {"url": "/publications/2009.html", "revision": "567b77fe57"},
+    {"url": "/publications/2010.html", "revision": "4a4e07b36a"},
+    {"url": "/publications/2011.html", "revision": "01a296d38c"},
+    {"url": "/publications/2012.html", "revision": "2b99ffeeee"},
+    {"url": "/publications/2013.html", "revision": "2e3969486a"},
+    {"url": "/publications/2014.html", "revision": "92cc84bd60"},
+    {"url": "/publications/2015.html", "revision": "ae93d505e4"},
+    {"url": "/publications/2016.html", "revision": "1cc01e047f"},
+    {"url": "/publications/2017.html", "revision": "efee23770b"},
+    {"url": "/publications/2018.html", "revision": "7736ac7489"},
+    {"url": "/publications/2019.html", "revision": "36deacee5e"},
+    {"url": "/publications/2020.html", "revision": "9356ed8e41"},
+    {"url": "/publications/2021.html", "revision": "fabd98aa15"},
+    {"url": "/research-grants.html", "revision": "03e239b5e3"}
 ];
 
-// Install event - cache essential resources
+// Precached responses are stored under their URL plus revision, so a file
+// is downloaded again only when its revision changes
+const precacheKeys = new Map(PRECACHE_MANIFEST.map(entry => [
+    new URL(entry.url, self.location).href,
+    new URL(`${entry.url}?__revision=${entry.revision}`, self.location).href
+]));
+
+// Install event - fetch precached files that are new or have changed
 self.addEventListener('install', event => {
     event.waitUntil(
-        caches.open(CACHE_NAME)
-            .then(cache => {
-                console.log('Opened cache');
-                return cache.addAll(urlsToCache);
-            })
+        caches.open(PRECACHE_NAME).then(cache =>
+            Promise.all(Array.from(precacheKeys, async ([url, key]) => {
+                if (await cache.match(key)) {
+                    return;
+                }
+                const response = await fetch(url, { cache: 'no-cache' });
+                if (!response.ok) {
+                    throw new Error(`Precaching ${url} failed: ${response.status}`);
+                }
+                await cache.put(key, response);
+            }))
+        ).then(() => self.skipWaiting())
     );
 });
 
-// Fetch event - serve cached content when offline
-self.addEventListener('fetch', event => {
-    event.respondWith(
-        caches.match(event.request)
-            .then(response => {
-                // Return cached version or fetch from network
-                return response || fetch(event.request);
-            })
-    );
+// Activate event - drop outdated revisions and caches of older versions
+self.addEventListener('activate', event => {
+    const currentKeys = new Set(precacheKeys.values());
+    event.waitUntil((async () => {
+        for (const cacheName of await caches.keys()) {
+            if (cacheName !== PRECACHE_NAME && cacheName !== GALLERY_CACHE_NAME) {
+                console.log('Deleting old cache:', cacheName);
+                await caches.delete(cacheName);
+            }
+        }
+        const cache = await caches.open(PRECACHE_NAME);
+        for (const request of await cache.keys()) {
+            if (!currentKeys.has(request.url)) {
+                await cache.delete(request);
+            }
+        }
+        await self.clients.claim();
+    })());
 });
 
-// Activate event - cleanup old caches
-self.addEventListener('activate', event => {
-    event.waitUntil(
-        caches.keys().then(cacheNames => {
-            return Promise.all(
-                cacheNames.map(cacheName => {
-                    if (cacheName !== CACHE_NAME) {
-                        console.log('Deleting old cache:', cacheName);
-                        return caches.delete(cacheName);
-                    }
-                })
-            );
-        })
-    );
-});
\ No newline at end of file
+// Keep the gallery cache bounded; keys are ordered from least to most
+// recently stored, and every use stores the image again
+async function trimGalleryCache(cache) {
+    const keys = await cache.keys();
+    for (let i = 0; i < keys.length - GALLERY_CACHE_ENTRIES; i++) {
+        await cache.delete(keys[i]);
+    }
+}
+
+// Stale-while-revalidate: answer from the cache at once when possible and
+// refresh the cached image from the network in the background
+async function galleryImage(event) {
+    const cache = await caches.open(GALLERY_CACHE_NAME);
+    const cached = await cache.match(event.request);
+    const refresh = fetch(event.request).then(async response => {
+        if (response.ok) {
+            await cache.put(event.request, response.clone());
+        }
+        return response;
+    }).catch(async error => {
+        if (!cached) {
+            throw error;
+        }
+        // Offline: store the cached copy again to mark it as recently used
+        await cache.delete(event.request);
+        await cache.put(event.request, cached.clone());
+        return cached;
+    }).then(async response => {
+        await trimGalleryCache(cache);
+        return response;
+    });
+    event.waitUntil(refresh.catch(() => {}));
+    return cached ? cached.clone() : refresh;
+}
+
+// Network-first: the current page when online, the precached one offline
+async function precachedPage(event, precacheKey) {
+    try {
+        return await fetch(event.request);
+    } catch (error) {
+        const cached = await caches.open(PRECACHE_NAME).then(cache => cache.match(precacheKey));
+        if (!cached) {
+            throw error;
+        }
+        return cached;
+    }
+}
+
+// Fetch event - pages and fragments come from the network with the
+// precache as fallback, other precached files from the cache, gallery
+// images from the runtime cache, everything else from the network with a
+// cached fallback
+self.addEventListener('fetch', event => {
+    if (event.request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(event.request.url);
+    url.hash = '';
+    const precacheKey = url.origin === self.location.origin && !url.search && precacheKeys.get(url.href);
+    if (precacheKey && (event.request.mode === 'navigate' ||
+                        FRAGMENT_PREFIXES.some(prefix => url.pathname.startsWith(prefix)))) {
+        event.respondWith(precachedPage(event, precacheKey));
+    } else if (precacheKey) {
+        event.respondWith(
+            caches.open(PRECACHE_NAME)
+                .then(cache => cache.match(precacheKey))
+                .then(response => response || fetch(event.request))
+        );
+    } else if (url.origin === self.location.origin &&
+               GALLERY_PREFIXES.some(prefix => url.pathname.startsWith(prefix))) {
+        event.respondWith(galleryImage(event));
+    } else {
+        event.respondWith(
+            fetch(event.request).catch(() =>
+                caches.match(event.request).then(response => response || Response.error()))
+        );
+    }
+});